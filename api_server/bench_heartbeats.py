@@ -0,0 +1,41 @@
+"""
+Measure heartbeat ingest cost at 10k nodes: one request per node versus the
+batched /node/heartbeats endpoint. Requests go through Flask's test client, so
+the numbers exclude network and connection setup, which only widens the gap
+for per-node requests in a real deployment.
+"""
+import time
+import uuid
+
+import server
+
+NUM_NODES = 10000
+
+
+def main():
+    client = server.create_app(start_workers=False).test_client()
+
+    # Register nodes directly; ingest cost doesn't depend on their containers
+    node_ids = [str(uuid.uuid4()) for _ in range(NUM_NODES)]
+    for node_id in node_ids:
+        server.nodes[node_id] = {"container_id": node_id, "cpu_cores": 4.0, "status": "active", "pods": []}
+
+    started = time.perf_counter()
+    for node_id in node_ids:
+        client.post(f"/node/heartbeat/{node_id}")
+    single = time.perf_counter() - started
+    print(f"Per-node requests: {NUM_NODES} heartbeats in {single:.3f}s "
+          f"({single / NUM_NODES * 1e6:.1f} us/heartbeat)")
+
+    for batch_size in (100, 1000, NUM_NODES):
+        started = time.perf_counter()
+        for i in range(0, NUM_NODES, batch_size):
+            batch = [{"node_id": node_id, "load": 0.5} for node_id in node_ids[i:i + batch_size]]
+            client.post("/node/heartbeats", json={"heartbeats": batch})
+        batched = time.perf_counter() - started
+        print(f"Batches of {batch_size}: {NUM_NODES} heartbeats in {batched:.3f}s "
+              f"({batched / NUM_NODES * 1e6:.1f} us/heartbeat, {single / batched:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure cold-start time to the first served request. Each run starts a fresh
+interpreter that imports the server, builds the app with create_app(), starts
+the background workers, serves on an ephemeral port and times one GET /.
+
+    python bench_startup.py --runs 10 --record startup_times.jsonl
+
+With --record, the median of each phase is appended as one JSON line so
+startup regressions can be tracked across changes.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs in the child interpreter; prints phase timings as one JSON line
+# (argv[1] is the parent's time.time() just before launching it)
+CHILD = r"""
+import json, sys, threading, time, urllib.request
+interpreter = time.time() - float(sys.argv[1])
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+app = server.create_app()
+created = time.perf_counter()
+from werkzeug.serving import make_server
+http_server = make_server("127.0.0.1", 0, app, threaded=True)
+threading.Thread(target=http_server.serve_forever, daemon=True).start()
+urllib.request.urlopen(f"http://127.0.0.1:{http_server.server_port}/").read()
+served = time.perf_counter()
+http_server.shutdown()
+server.stop_background_workers()
+print("STARTUP " + json.dumps({
+    "interpreter": interpreter,
+    "import": imported - started,
+    "create_app": created - imported,
+    "first_request": served - created
+}))
+"""
+
+PHASES = ("interpreter", "import", "create_app", "first_request", "total")
+
+
+def run_once():
+    """
+    Time one cold start, from launching the child up to its first served
+    request. The child's shutdown and interpreter teardown are not counted.
+    """
+    result = subprocess.run([sys.executable, "-c", CHILD, repr(time.time())],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    line = next(line for line in result.stdout.splitlines() if line.startswith("STARTUP "))
+    timings = json.loads(line[len("STARTUP "):])
+    timings["total"] = sum(timings[phase] for phase in PHASES if phase != "total")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API server cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", help="Append the medians as a JSON line to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    medians = {phase: statistics.median(run[phase] for run in runs) for phase in PHASES}
+    for phase in PHASES:
+        print(f"{phase:>14}: {medians[phase] * 1000:7.1f} ms (median of {args.runs})")
+
+    if args.record:
+        with open(args.record, "a") as f:
+            f.write(json.dumps({"timestamp": time.time(), "runs": args.runs,
+                                **{f"{phase}_ms": medians[phase] * 1000 for phase in PHASES}}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+import server
+
+
+class FakeContainer:
+    id = "container"
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """The server module with node containers faked out; its cluster state is cleared afterwards"""
+    monkeypatch.setattr(server, "start_node_container", lambda node_id, cpu_cores: FakeContainer())
+    yield server
+    server.disable_profiling()
+    with server.cluster_lock:
+        for pod_id in list(server.pods):
+            server.preemption_index.remove(pod_id)
+        for node_id in list(server.nodes):
+            server.preemption_index.remove_node(node_id)
+        for state in (server.nodes, server.pods, server.heartbeats, server.reservations,
+                      server.reserved_cpu, server.pending_pods):
+            state.clear()
@@ -0,0 +1,146 @@
+import queue
+import threading
+
+# Container events that mean a node is gone
+FAILURE_EVENTS = ("die", "oom", "stop")
+
+
+class DockerEventSource:
+    """
+    Node container events and listings from the Docker engine. `get_client()`
+    is called on each use, so the connection is made lazily by the caller.
+    """
+
+    def __init__(self, get_client, name_prefix="node_"):
+        self.get_client = get_client
+        self.name_prefix = name_prefix
+        self._stream = None
+
+    def events(self):
+        """Yield (container_id, action) for failure events on node containers"""
+        self._stream = self.get_client().events(
+            decode=True,
+            filters={"type": "container", "event": list(FAILURE_EVENTS)}
+        )
+        for event in self._stream:
+            actor = event.get("Actor", {})
+            name = actor.get("Attributes", {}).get("name", "")
+            if not name.startswith(self.name_prefix):
+                continue
+            yield actor.get("ID") or event.get("id"), event.get("Action") or event.get("status")
+
+    def running_container_ids(self):
+        """IDs of node containers that are currently running"""
+        containers = self.get_client().containers.list(filters={"name": self.name_prefix, "status": "running"})
+        return {container.id for container in containers}
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+
+
+class FakeEventSource:
+    """
+    In-memory stand-in for DockerEventSource, for running without a Docker daemon.
+    Containers are "running" once started and until a failure event is emitted.
+    """
+
+    def __init__(self):
+        self.running = set()
+        self._events = queue.Queue()
+
+    def start_container(self, container_id):
+        self.running.add(container_id)
+
+    def emit(self, container_id, action="die"):
+        """Simulate a Docker event for a container"""
+        if action in FAILURE_EVENTS:
+            self.running.discard(container_id)
+        self._events.put((container_id, action))
+
+    def kill_silently(self, container_id):
+        """Stop a container without an event, as if the event was missed"""
+        self.running.discard(container_id)
+
+    def events(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            yield event
+
+    def running_container_ids(self):
+        return set(self.running)
+
+    def close(self):
+        self._events.put(None)
+
+
+class NodeHealthWatcher:
+    """
+    Fails nodes as soon as their container dies, using an event source, and
+    periodically reconciles against the list of running containers in case
+    events were missed.
+
+    `containers()` returns a {container_id: node_id} map of active nodes and
+    `on_failure(node_id, reason)` is called for each node found dead.
+    """
+
+    def __init__(self, source, containers, on_failure, reconcile_interval=30):
+        self.source = source
+        self.containers = containers
+        self.on_failure = on_failure
+        self.reconcile_interval = reconcile_interval
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._watch_events, daemon=True),
+            threading.Thread(target=self._reconcile_loop, daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """Stop watching; with a timeout, wait up to that long for each thread to exit"""
+        self._stopped.set()
+        self.source.close()
+        if timeout is not None:
+            for thread in self._threads:
+                thread.join(timeout)
+
+    def _watch_events(self):
+        """Consume the event stream, reconnecting with backoff if it drops"""
+        backoff = 1
+        while not self._stopped.is_set():
+            try:
+                for container_id, action in self.source.events():
+                    backoff = 1
+                    node_id = self.containers().get(container_id)
+                    if node_id:
+                        self.on_failure(node_id, f"container {action}")
+            except Exception as e:
+                print(f"Docker event stream error: {e}")
+            if self._stopped.wait(backoff):
+                return
+            backoff = min(backoff * 2, 30)
+
+    def reconcile(self):
+        """Fail active nodes whose container is no longer running"""
+        # Snapshot nodes before listing so nodes added meanwhile aren't misjudged
+        containers = self.containers()
+        running = self.source.running_container_ids()
+        failed = []
+        for container_id, node_id in containers.items():
+            if container_id not in running:
+                self.on_failure(node_id, "container not running")
+                failed.append(node_id)
+        return failed
+
+    def _reconcile_loop(self):
+        while not self._stopped.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception as e:
+                print(f"Container reconciliation failed: {e}")
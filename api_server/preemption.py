@@ -0,0 +1,223 @@
+import bisect
+
+
+# Nodes tried per priority level before settling on the best plan found
+MAX_CANDIDATES = 64
+
+
+class PreemptionIndex:
+    """
+    Index of running pods by priority level and node, used to find preemption
+    victims without scanning every node and pod in the cluster.
+
+    Levels are searched from the lowest priority upwards, so the search stops
+    at the first level where some node can fit the incoming pod. This keeps
+    the highest evicted priority as low as possible.
+
+    The index also tracks the free CPU of each active node, net of placement
+    reservations. For every level it keeps nodes sorted two ways: by free CPU
+    plus the largest pod reclaimable at or below that level, which finds
+    nodes where a single eviction is enough, and by free CPU plus all CPU
+    reclaimable there, which finds every node that can fit the pod at all.
+    """
+
+    def __init__(self):
+        self.levels = {}       # priority -> {node_id: {pod_id: cpu_cores}}
+        self.priorities = []   # Sorted list of priorities present in `levels`
+        self.locations = {}    # pod_id -> (priority, node_id)
+        self.capacity = {}     # node_id -> CPU cores of active nodes
+        self.used = {}         # node_id -> CPU held by running pods
+        self.reserved = {}     # node_id -> CPU held by placement reservations
+        # priority -> {"keys": {node_id: (fit key, single key)},
+        #              "fit": sorted [(free + all reclaimable CPU, node_id)],
+        #              "single": sorted [(free + largest reclaimable pod, node_id)]}
+        self.level_index = {}
+
+    def add_node(self, node_id, cpu_cores):
+        """Record an active node"""
+        self.capacity[node_id] = float(cpu_cores)
+        self.used.setdefault(node_id, 0.0)
+        self._refresh(node_id)
+
+    def remove_node(self, node_id):
+        """Forget a node that failed; its pods can no longer be reclaimed there"""
+        self.capacity.pop(node_id, None)
+        self.reserved.pop(node_id, None)
+        self._refresh(node_id)
+
+    def set_reserved(self, node_id, cpu_cores):
+        """Record the CPU that reservations hold on a node; it can't be preempted for"""
+        if cpu_cores > 0:
+            self.reserved[node_id] = float(cpu_cores)
+        else:
+            self.reserved.pop(node_id, None)
+        self._refresh(node_id)
+
+    def free(self, node_id):
+        return (self.capacity.get(node_id, 0.0) - self.used.get(node_id, 0.0)
+                - self.reserved.get(node_id, 0.0))
+
+    def add(self, pod_id, node_id, priority, cpu_cores):
+        """Record a pod running on a node"""
+        if pod_id in self.locations:
+            self.remove(pod_id)
+        if priority not in self.levels:
+            self.levels[priority] = {}
+            bisect.insort(self.priorities, priority)
+            self._build_level(priority)
+        self.levels[priority].setdefault(node_id, {})[pod_id] = float(cpu_cores)
+        self.locations[pod_id] = (priority, node_id)
+        self.used[node_id] = self.used.get(node_id, 0.0) + float(cpu_cores)
+        self._refresh(node_id)
+
+    def remove(self, pod_id):
+        """Forget a pod that stopped running"""
+        location = self.locations.pop(pod_id, None)
+        if location is None:
+            return
+        priority, node_id = location
+        level = self.levels[priority]
+        self.used[node_id] -= level[node_id].pop(pod_id)
+        if not level[node_id]:
+            del level[node_id]
+        if not level:
+            del self.levels[priority]
+            self.priorities.remove(priority)
+            del self.level_index[priority]
+        if node_id not in self.capacity and self.used[node_id] <= 1e-9:
+            del self.used[node_id]
+        self._refresh(node_id)
+
+    def move(self, pod_id, node_id):
+        """Update the node of a pod that was migrated"""
+        location = self.locations.get(pod_id)
+        if location is None:
+            return
+        priority, old_node_id = location
+        cpu_cores = self.levels[priority][old_node_id][pod_id]
+        self.add(pod_id, node_id, priority, cpu_cores)
+
+    def _keys(self, node_id, reclaimable, largest):
+        free = self.free(node_id)
+        return round(free + reclaimable, 9), round(free + largest, 9)
+
+    def _refresh(self, node_id):
+        """Re-sort a node at every level after its free or reclaimable CPU changed"""
+        active = node_id in self.capacity
+        reclaimable = 0.0
+        largest = 0.0
+        for priority in self.priorities:
+            level_pods = self.levels[priority].get(node_id, {})
+            reclaimable += sum(level_pods.values())
+            largest = max(largest, max(level_pods.values(), default=0.0))
+            index = self.level_index[priority]
+            old_keys = index["keys"].pop(node_id, None)
+            if old_keys is not None:
+                for order, key in zip((index["fit"], index["single"]), old_keys):
+                    del order[bisect.bisect_left(order, (key, node_id))]
+            # Only nodes with something to reclaim at this level are candidates
+            if active and reclaimable > 0:
+                keys = index["keys"][node_id] = self._keys(node_id, reclaimable, largest)
+                for order, key in zip((index["fit"], index["single"]), keys):
+                    bisect.insort(order, (key, node_id))
+
+    def _build_level(self, priority):
+        """Sort the nodes for a new priority level by the CPU they could free"""
+        reclaimable = {}
+        largest = {}
+        for level_priority in self.priorities:
+            if level_priority > priority:
+                break
+            for node_id, level_pods in self.levels[level_priority].items():
+                reclaimable[node_id] = reclaimable.get(node_id, 0.0) + sum(level_pods.values())
+                largest[node_id] = max(largest.get(node_id, 0.0), max(level_pods.values()))
+        keys = {
+            node_id: self._keys(node_id, cpu, largest[node_id])
+            for node_id, cpu in reclaimable.items()
+            if node_id in self.capacity and cpu > 0
+        }
+        self.level_index[priority] = {
+            "keys": keys,
+            "fit": sorted((fit, node_id) for node_id, (fit, _) in keys.items()),
+            "single": sorted((single, node_id) for node_id, (_, single) in keys.items())
+        }
+
+    def find_victims(self, cpu_cores, priority):
+        """
+        Find the cheapest set of lower-priority pods on one node to evict:
+        fewest victims, then least CPU evicted. Returns (node_id, [pod_id, ...])
+        or (None, []) when preemption cannot help.
+
+        A single-victim plan is always found when one exists. Otherwise, and
+        for the least-CPU tie-break, at most MAX_CANDIDATES nodes are compared,
+        so with more candidates than that the plan is approximate.
+        """
+        cpu_cores = float(cpu_cores)
+        target = (round(cpu_cores, 9),)
+
+        for level_priority in self.priorities:
+            if level_priority >= priority:
+                break
+            index = self.level_index[level_priority]
+
+            # Nodes where one eviction is enough, tightest first: these evict the least CPU
+            single = index["single"]
+            start = bisect.bisect_left(single, target)
+            if start < len(single):
+                candidates = [node_id for _, node_id in single[start:start + MAX_CANDIDATES]]
+            else:
+                # Several victims needed; nodes with the most to spare need the fewest
+                fit = index["fit"]
+                start = bisect.bisect_left(fit, target)
+                if start == len(fit):
+                    continue
+                candidates = [node_id for _, node_id in reversed(fit[max(start, len(fit) - MAX_CANDIDATES):])]
+
+            best_node = None
+            best_victims = None
+            best_cost = None
+            for node_id in candidates:
+                victims = self._victims_on_node(node_id, cpu_cores - self.free(node_id), level_priority)
+                cost = (len(victims), sum(cpu for _, cpu in victims))
+                if best_cost is None or cost < best_cost:
+                    best_node, best_victims, best_cost = node_id, victims, cost
+            return best_node, [pod_id for pod_id, _ in best_victims]
+
+        return None, []
+
+    def _victims_on_node(self, node_id, needed_cpu, max_priority):
+        """
+        Pick victims on one node: the smallest single pod that frees enough,
+        otherwise lowest priority and largest pods first
+        """
+        if needed_cpu <= 0:
+            return []
+
+        single = None
+        for level_priority in self.priorities:
+            if level_priority > max_priority:
+                break
+            for pod_id, cpu in self.levels[level_priority].get(node_id, {}).items():
+                if cpu >= needed_cpu and (single is None or cpu < single[1]):
+                    single = (pod_id, cpu)
+        if single is not None:
+            return [single]
+
+        victims = []
+        reclaimed = 0.0
+        for level_priority in self.priorities:
+            if level_priority > max_priority or reclaimed >= needed_cpu:
+                break
+            level_pods = self.levels[level_priority].get(node_id, {})
+            for pod_id, cpu in sorted(level_pods.items(), key=lambda p: p[1], reverse=True):
+                if reclaimed >= needed_cpu:
+                    break
+                victims.append((pod_id, cpu))
+                reclaimed += cpu
+
+        # Reprieve victims that turned out to be unnecessary, highest priority first
+        for victim in reversed(list(victims)):
+            if reclaimed - victim[1] >= needed_cpu:
+                victims.remove(victim)
+                reclaimed -= victim[1]
+        return victims
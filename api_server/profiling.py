@@ -0,0 +1,178 @@
+"""
+Opt-in request tracing and on-demand sampling profiles for the API server.
+
+Nothing here is imported or installed unless profiling is enabled (see
+server.enable_profiling); until then the server's span hooks pass straight
+through.
+"""
+import collections
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+from flask import Blueprint, jsonify, request
+
+# Leaf frames of threads that are parked rather than working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+}
+
+
+class RequestTracer:
+    """
+    Records per-request timing spans. Blocks run under `span()` add their
+    duration to the current request's spans; blocks on background threads
+    are not recorded. Totals are returned in a Server-Timing header and, when
+    `log_path` is set, appended to that file as JSON lines.
+    """
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self._local = threading.local()
+        self._log_lock = threading.Lock()
+
+    def install(self, app):
+        app.before_request(self._begin)
+        app.after_request(self._finish)
+        app.teardown_request(self._clear)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Add the run time of the block to span `name` of the current request"""
+        spans = getattr(self._local, "spans", None)
+        if spans is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            spans[name] += time.perf_counter() - started
+
+    def _begin(self):
+        self._local.spans = collections.defaultdict(float)
+        self._local.started = time.perf_counter()
+
+    def _finish(self, response):
+        spans = getattr(self._local, "spans", None)
+        if spans is None:
+            return response
+        spans["total"] = time.perf_counter() - self._local.started
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={duration * 1000:.3f}" for name, duration in spans.items()
+        )
+        if self.log_path:
+            entry = {
+                "timestamp": time.time(),
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "spans_ms": {name: round(duration * 1000, 3) for name, duration in spans.items()}
+            }
+            with self._log_lock, open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return response
+
+    def _clear(self, exc):
+        self._local.spans = None
+
+
+def frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads at a fixed interval. Unlike cProfile it
+    sees every request thread and background worker, and its cost only lasts
+    for the duration of a capture. One capture runs at a time.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._busy = threading.Lock()
+
+    def capture(self, seconds, limit=30, include_idle=False):
+        """Sample for `seconds` on the calling thread; returns None if a capture is already running"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            return self._capture(seconds, limit, include_idle)
+        finally:
+            self._busy.release()
+
+    def _capture(self, seconds, limit, include_idle):
+        own_thread = threading.get_ident()
+        self_counts = collections.Counter()
+        total_counts = collections.Counter()
+        stacks = collections.Counter()
+        samples = 0
+        idle_samples = 0
+
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                leaf = frame.f_code
+                if not include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                    idle_samples += 1
+                    continue
+
+                labels = []
+                while frame is not None:
+                    labels.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                samples += 1
+                self_counts[labels[0]] += 1
+                total_counts.update(set(labels))  # Recursion counts once per sample
+                stacks[";".join(reversed(labels))] += 1
+            time.sleep(self.interval)
+
+        def percent(count):
+            return round(100 * count / samples, 2) if samples else 0.0
+
+        return {
+            "seconds": seconds,
+            "interval": self.interval,
+            "samples": samples,
+            "idle_samples": idle_samples,
+            "functions": [
+                {"function": label, "total": count, "total_pct": percent(count),
+                 "self": self_counts[label], "self_pct": percent(self_counts[label])}
+                for label, count in total_counts.most_common(limit)
+            ],
+            "stacks": [{"stack": stack, "samples": count} for stack, count in stacks.most_common(limit)]
+        }
+
+
+def profiling_blueprint(profiler, max_seconds=60):
+    """Debug routes for on-demand captures"""
+    debug = Blueprint("debug", __name__)
+
+    @debug.route("/debug/profile", methods=["POST"])
+    def capture_profile():
+        """Sample all threads for `seconds` and return aggregated stats"""
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        try:
+            seconds = float(data.get("seconds", 5))
+            limit = int(data.get("limit", 30))
+        except (TypeError, ValueError):
+            return jsonify({"error": "seconds and limit must be numbers"}), 400
+        if not 0 < seconds <= max_seconds:
+            return jsonify({"error": f"seconds must be between 0 and {max_seconds}"}), 400
+
+        report = profiler.capture(seconds, limit, bool(data.get("include_idle", False)))
+        if report is None:
+            return jsonify({"error": "A profile capture is already running"}), 409
+        return jsonify(report), 200
+
+    return debug
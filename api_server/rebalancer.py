@@ -0,0 +1,179 @@
+import bisect
+import heapq
+import threading
+import time
+
+
+def free_cpu(node_info):
+    """Return the unallocated CPU on a node"""
+    used_cpu = sum(float(pod["cpu_cores"]) for pod in node_info.get("pods", []))
+    return float(node_info["cpu_cores"]) - used_cpu
+
+
+def best_fit(candidates, cpu_cores):
+    """Pick the node that fits `cpu_cores` with the least CPU left over, from (node_id, free) pairs"""
+    best_node = None
+    min_remaining_cpu = float('inf')
+    for node_id, available_cpu in candidates:
+        remaining_cpu = available_cpu - float(cpu_cores)
+        if 0 <= remaining_cpu < min_remaining_cpu:
+            min_remaining_cpu = remaining_cpu
+            best_node = node_id
+    return best_node
+
+
+class Rebalancer:
+    """
+    Consolidates fragmented free CPU by migrating a few pods per cycle.
+
+    Each cycle takes a snapshot of the active nodes, picks the node whose free
+    capacity can be grown the most by moving at most `max_migrations` of its
+    pods elsewhere, and then applies those moves one at a time under the
+    cluster lock. Planning happens on the snapshot, so request handling is
+    only blocked for the duration of a single migration.
+
+    Only the `candidate_sources` nodes with the most free CPU are considered
+    as sources, and targets are found by bisecting a list of nodes sorted by
+    free CPU, so planning stays cheap on large clusters.
+    """
+
+    def __init__(self, nodes, pods, lock, max_migrations=5, interval=30, on_migrate=None,
+                 candidate_sources=8, after_migrations=None, free_of=None):
+        self.nodes = nodes
+        self.pods = pods
+        self.lock = lock
+        self.max_migrations = max_migrations
+        self.interval = interval
+        self.on_migrate = on_migrate  # Called as on_migrate(pod_id, source_id, target_id)
+        self.candidate_sources = candidate_sources
+        self.after_migrations = after_migrations  # Called after a cycle that moved pods
+        # free_of(node_id) returns the CPU a node can take, e.g. net of reservations
+        self.free_of = free_of or (lambda node_id: free_cpu(self.nodes[node_id]))
+        self.last_report = None
+        self._cycle_lock = threading.Lock()  # One cycle at a time
+
+    def _snapshot(self):
+        """Copy the placement state of active nodes"""
+        with self.lock:
+            return {
+                node_id: {
+                    "free": self.free_of(node_id),
+                    "pods": [(pod["pod_id"], float(pod["cpu_cores"])) for pod in node_info.get("pods", [])]
+                }
+                for node_id, node_info in self.nodes.items()
+                if node_info["status"] == "active"
+            }
+
+    @staticmethod
+    def largest_placeable(snapshot):
+        """Largest pod that could be placed on a single node right now"""
+        return max((info["free"] for info in snapshot.values()), default=0.0)
+
+    def plan(self, max_migrations=None):
+        """Plan a list of (pod_id, source_node, target_node) migrations"""
+        budget = self.max_migrations if max_migrations is None else max_migrations
+        snapshot = self._snapshot()
+        best_free = self.largest_placeable(snapshot)
+        best_moves = []
+
+        # Nodes that already have the most free CPU need the fewest moves to grow it
+        sources = heapq.nlargest(
+            self.candidate_sources,
+            (node_id for node_id, info in snapshot.items() if info["pods"]),
+            key=lambda node_id: snapshot[node_id]["free"]
+        )
+        targets = sorted((info["free"], node_id) for node_id, info in snapshot.items())
+
+        for source_id in sources:
+            source = snapshot[source_id]
+            free = list(targets)  # Simulated per source
+            del free[bisect.bisect_left(free, (source["free"], source_id))]
+            source_free = source["free"]
+
+            # Simulate draining the largest pods first onto other nodes (best-fit)
+            moves = []
+            for pod_id, cpu_cores in sorted(source["pods"], key=lambda p: p[1], reverse=True):
+                if len(moves) >= budget:
+                    break
+
+                # Smallest free capacity that still fits the pod
+                index = bisect.bisect_left(free, (cpu_cores,))
+                if index == len(free):
+                    continue
+                target_free, target_id = free.pop(index)
+                bisect.insort(free, (target_free - cpu_cores, target_id))
+                source_free += cpu_cores
+                moves.append((pod_id, source_id, target_id))
+
+                # Keep the shortest prefix that beats the best plan so far
+                if source_free > best_free:
+                    best_free = source_free
+                    best_moves = list(moves)
+
+            time.sleep(0)  # Let request threads run between sources
+
+        return best_moves
+
+    def _apply(self, pod_id, source_id, target_id):
+        """Apply one migration if it is still valid"""
+        with self.lock:
+            source = self.nodes.get(source_id)
+            target = self.nodes.get(target_id)
+            pod_info = self.pods.get(pod_id)
+            if not source or not target or not pod_info:
+                return False
+            if source["status"] != "active" or target["status"] != "active":
+                return False
+            if pod_info["node_id"] != source_id:
+                return False
+
+            pod = next((p for p in source["pods"] if p["pod_id"] == pod_id), None)
+            if pod is None or self.free_of(target_id) < float(pod["cpu_cores"]):
+                return False
+
+            source["pods"] = [p for p in source["pods"] if p["pod_id"] != pod_id]
+            target["pods"].append(pod)
+            pod_info["node_id"] = target_id
+            if self.on_migrate:
+                self.on_migrate(pod_id, source_id, target_id)
+            return True
+
+    def run_cycle(self, max_migrations=None):
+        """Plan and apply one rebalancing cycle, returning a report"""
+        with self._cycle_lock:
+            started = time.time()
+            before = self.largest_placeable(self._snapshot())
+            planned = self.plan(max_migrations)
+
+            migrated = []
+            for pod_id, source_id, target_id in planned:
+                if self._apply(pod_id, source_id, target_id):
+                    migrated.append({"pod_id": pod_id, "from": source_id, "to": target_id})
+                    print(f"Migrated pod {pod_id[:8]}... from node {source_id[:8]}... to node {target_id[:8]}...")
+
+            if migrated and self.after_migrations:
+                self.after_migrations()
+
+            after = self.largest_placeable(self._snapshot())
+            self.last_report = {
+                "timestamp": started,
+                "planned_migrations": len(planned),
+                "migrations": migrated,
+                "largest_placeable_before": before,
+                "largest_placeable_after": after,
+                "largest_placeable_gain": after - before,
+                "duration_seconds": time.time() - started
+            }
+            return self.last_report
+
+    def run_forever(self, stopped=None):
+        """Background loop running a cycle every `interval` seconds until `stopped` is set"""
+        stopped = stopped or threading.Event()
+        while not stopped.wait(self.interval):
+            try:
+                report = self.run_cycle()
+                if report["migrations"]:
+                    print(f"Rebalance cycle moved {len(report['migrations'])} pods, "
+                          f"largest placeable pod grew by {report['largest_placeable_gain']:.2f} CPU")
+            except Exception as e:
+                print(f"Rebalance cycle failed: {e}")
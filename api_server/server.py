@@ -1,61 +1,292 @@
-from flask import Flask, request, jsonify
-import docker
+from flask import Blueprint, Flask, request
+import flask
+import contextlib
 import uuid
 import threading
 import time
+import itertools
+import os
+from rebalancer import Rebalancer, best_fit, free_cpu
+from preemption import PreemptionIndex
+from health import DockerEventSource, NodeHealthWatcher
 
-app = Flask(__name__)
-docker_client = docker.from_env()
+# Routes are registered on a blueprint and mounted by create_app(), so importing
+# this module has no side effects: no Docker connection and no threads
+api = Blueprint("api", __name__)
+
+# Profiling hooks: `tracer` is a profiling.RequestTracer while profiling is
+# enabled (see enable_profiling) and None otherwise, when every hook below
+# passes straight through
+tracer = None
+_no_span = contextlib.nullcontext()
+
+def span(name):
+    """Context manager adding its block's run time to the current request's `name` span"""
+    return _no_span if tracer is None else tracer.span(name)
+
+def jsonify(*args, **kwargs):
+    """flask.jsonify, traced as the serialize span"""
+    if tracer is None:
+        return flask.jsonify(*args, **kwargs)
+    with tracer.span("serialize"):
+        return flask.jsonify(*args, **kwargs)
+
+class ClusterLock:
+    """Reentrant lock whose acquire waits are traced as the lock_wait span"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        if tracer is None:
+            return self._lock.acquire(blocking, timeout)
+        with tracer.span("lock_wait"):
+            return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
 
 # Data structures to track nodes, pods, and heartbeats
 nodes = {}  # Stores node information
 pods = {}   # Stores pod information separately for recovery
 heartbeats = {}  # Tracks last heartbeat time for each node
+node_loads = {}  # Latest load sample reported by each node's agent
+
+# When set, node containers run node_agent/agent.py and report to this URL
+# instead of relying on simulated heartbeats
+NODE_AGENT_API_URL = os.environ.get("NODE_AGENT_API_URL")
+# host:port of a UDP heartbeat aggregator that node agents report to. If unset,
+# the server starts a shared aggregator container on the first node add, so
+# heartbeats reach the API in batches rather than one request per node
+HEARTBEAT_AGGREGATOR = os.environ.get("HEARTBEAT_AGGREGATOR")
+AGGREGATOR_CONTAINER = "heartbeat_aggregator"
+AGGREGATOR_PORT = 9100
+# Opt-in profiling: API_PROFILING=1 adds Server-Timing spans and /debug/profile,
+# and API_TRACE_LOG also appends each request's spans to that file
+API_PROFILING = os.environ.get("API_PROFILING", "").lower() in ("1", "true", "yes")
+API_TRACE_LOG = os.environ.get("API_TRACE_LOG")
+# API_SCHEDULER_SHARDS=N serves the API from a sharded scheduler with N worker
+# processes instead (CPU placement only, see sharding.py)
+API_SCHEDULER_SHARDS = int(os.environ.get("API_SCHEDULER_SHARDS", "0"))
+NODE_AGENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "node_agent")
+cluster_lock = ClusterLock()  # Guards placement changes to nodes and pods
+pending_pods = set()  # Pods waiting for capacity, retried when it frees up
+preemption_index = PreemptionIndex()  # Running pods by priority for victim search
+resource_versions = itertools.count(1)  # Cluster-wide counter for object resource versions
+reservations = {}  # reservation_id -> {"node_id", "cpu_cores", "expires_at"}
+reserved_cpu = {}  # node_id -> CPU held by unexpired reservations
+
+_docker_client = None  # Created on first use by get_docker_client()
+_docker_lock = threading.Lock()
+workers_stopped = threading.Event()  # Set to stop the background loops
+background_threads = []  # Background worker threads started by start_background_workers()
+health_watcher = None
+_aggregator_address = HEARTBEAT_AGGREGATOR  # Set once the aggregator is known to be running
+_aggregator_lock = threading.Lock()
+
+def get_docker_client():
+    """Connect to the Docker engine on first use and reuse the client afterwards"""
+    global _docker_client
+    with _docker_lock:
+        if _docker_client is None:
+            # Imported lazily: the docker package is slow to import and only
+            # needed once a node is added or the health watcher connects
+            import docker
+            _docker_client = docker.from_env()
+        return _docker_client
 
 class PodScheduler:
     @staticmethod
     def select_node(cpu_requirement):
         """Select the best node for pod placement based on available resources"""
-        best_node = None
-        min_remaining_cpu = float('inf')
+        candidates = (
+            # Available CPU on active nodes, leaving room for placement reservations
+            (node_id, free_cpu(node_info) - reserved_cpu.get(node_id, 0.0))
+            for node_id, node_info in nodes.items()
+            if node_info["status"] == "active"
+        )
+        # Best-fit: the node with least remaining resources after placement
+        with span("scheduler"):
+            return best_fit(candidates, cpu_requirement)
+
+def bump_version(obj):
+    """Give a node or pod record a new resource version"""
+    obj["resource_version"] = next(resource_versions)
+
+def expected_version():
+    """Resource version a conditional request expects, from If-Match or the JSON body"""
+    version = request.headers.get("If-Match")
+    if version is None:
+        data = request.get_json(silent=True)
+        version = data.get("resource_version") if isinstance(data, dict) else None
+    if version is None:
+        return None
+    return int(str(version).strip('"'))
+
+def version_conflict(kind, object_id, obj):
+    """409 response for a conditional request whose version is stale"""
+    return jsonify({
+        "error": f"{kind} {object_id} was modified (resource version mismatch)",
+        "resource_version": obj.get("resource_version")
+    }), 409
+
+def expire_reservations():
+    """
+    Drop placement reservations past their deadline and return their IDs.
+    Placement paths call this first so expired CPU is never held (caller
+    holds cluster_lock).
+    """
+    now = time.time()
+    expired = [r for r, info in reservations.items() if info["expires_at"] <= now]
+    for reservation_id in expired:
+        release_reservation(reservation_id)
+    return expired
+
+def release_reservation(reservation_id):
+    """Return a reservation's CPU to its node (caller holds cluster_lock)"""
+    reservation = reservations.pop(reservation_id, None)
+    if reservation is None:
+        return None
+    node_id = reservation["node_id"]
+    reserved_cpu[node_id] = reserved_cpu.get(node_id, 0.0) - reservation["cpu_cores"]
+    if reserved_cpu[node_id] <= 1e-9:
+        del reserved_cpu[node_id]
+    preemption_index.set_reserved(node_id, reserved_cpu.get(node_id, 0.0))
+    return reservation
+
+def place_pod(pod_id, allow_preemption=True, node_id=None):
+    """
+    Place a pod on a node, preempting lower-priority pods if needed.
+    Evicted victims are requeued. When node_id is given, the pod is bound to
+    that node only if it still fits. Caller holds cluster_lock.
+    """
+    pod_info = pods[pod_id]
+    cpu_cores = pod_info["cpu_cores"]
+    priority = pod_info.get("priority", 0)
+    
+    victims = []
+    if node_id is not None:
+        node_info = nodes.get(node_id)
+        fits = (node_info is not None and node_info["status"] == "active"
+                and free_cpu(node_info) - reserved_cpu.get(node_id, 0.0) >= float(cpu_cores))
+        selected_node = node_id if fits else None
+    else:
+        selected_node = PodScheduler.select_node(cpu_cores)
+    if selected_node is None and allow_preemption and node_id is None:
+        with span("scheduler"):
+            selected_node, victims = preemption_index.find_victims(cpu_cores, priority)
+        for victim_id in victims:
+            evict_pod(victim_id)
+            print(f"Preempted pod {victim_id[:8]}... (priority {pods[victim_id].get('priority', 0)}) "
+                  f"for pod {pod_id[:8]}... (priority {priority})")
+    
+    if selected_node is None:
+        # Mark pod as pending if no suitable node found
+        pod_info["status"] = "pending"
+        pod_info["node_id"] = None
+        pending_pods.add(pod_id)
+        bump_version(pod_info)
+        return None
+    
+    nodes[selected_node]["pods"].append({"pod_id": pod_id, "cpu_cores": cpu_cores, "priority": priority})
+    pod_info["node_id"] = selected_node
+    pod_info["status"] = "running"
+    pending_pods.discard(pod_id)
+    bump_version(nodes[selected_node])
+    bump_version(pod_info)
+    preemption_index.add(pod_id, selected_node, priority, cpu_cores)
+    
+    # Requeue victims without further preemption to avoid cascades
+    for victim_id in victims:
+        place_pod(victim_id, allow_preemption=False)
+    
+    return selected_node
+
+def evict_pod(pod_id):
+    """Take a pod off its node and mark it pending (caller holds cluster_lock)"""
+    node_id = pods[pod_id]["node_id"]
+    if node_id in nodes:
+        nodes[node_id]["pods"] = [pod for pod in nodes[node_id]["pods"] if pod["pod_id"] != pod_id]
+        bump_version(nodes[node_id])
+    preemption_index.remove(pod_id)
+    pods[pod_id]["status"] = "pending"
+    pods[pod_id]["node_id"] = None
+    pending_pods.add(pod_id)
+    bump_version(pods[pod_id])
+
+def mark_node_failed(node_id):
+    """
+    Mark a node as failed and reschedule its pods (caller holds cluster_lock).
+    Returns False if the node was already failed.
+    """
+    if nodes[node_id]["status"] == "failed":
+        return False
+    
+    # Mark node as failed
+    nodes[node_id]["status"] = "failed"
+    
+    # Get pods running on the failed node
+    failed_pods = nodes[node_id].get("pods", [])
+    
+    # Remove pods from failed node
+    nodes[node_id]["pods"] = []
+    bump_version(nodes[node_id])
+    preemption_index.remove_node(node_id)
+    
+    # Reservations on a failed node can never be bound
+    for reservation_id in [r for r, info in reservations.items() if info["node_id"] == node_id]:
+        release_reservation(reservation_id)
+    
+    # Attempt to reschedule each pod
+    reschedule_pods(failed_pods)
+    return True
+
+def reschedule_pods(failed_pods):
+    """Reschedule pods evicted from a failed node (caller holds cluster_lock)"""
+    for pod in failed_pods:
+        preemption_index.remove(pod["pod_id"])
+    
+    # Place critical pods first so they can preempt lower-priority ones
+    for pod in sorted(failed_pods, key=lambda p: pods[p["pod_id"]].get("priority", 0), reverse=True):
+        pod_id = pod["pod_id"]
         
-        for node_id, node_info in nodes.items():
-            # Skip failed nodes
-            if node_info["status"] != "active":
-                continue
-                
-            # Calculate used CPU on this node
-            used_cpu = sum(float(pod["cpu_cores"]) for pod in node_info.get("pods", []))
-            # Calculate available CPU
-            available_cpu = float(node_info["cpu_cores"]) - used_cpu
-            
-            # Check if this node has enough resources
-            if available_cpu >= float(cpu_requirement):
-                # Use best-fit strategy: choose the node with least remaining resources after placement
-                remaining_cpu = available_cpu - float(cpu_requirement)
-                if remaining_cpu < min_remaining_cpu:
-                    min_remaining_cpu = remaining_cpu
-                    best_node = node_id
+        print(f"Rescheduling pod {pod_id[:8]}... (CPU: {pod['cpu_cores']})...")
         
-        return best_node
+        new_node = place_pod(pod_id)
+        if new_node:
+            print(f"Pod {pod_id[:8]}... rescheduled to node {new_node[:8]}...")
+        else:
+            print(f"Pod {pod_id[:8]}... marked as pending - no suitable node found")
+
+def retry_pending_pods():
+    """Try to place pending pods, highest priority first (caller holds cluster_lock)"""
+    expire_reservations()
+    for pod_id in sorted(pending_pods, key=lambda p: pods[p].get("priority", 0), reverse=True):
+        if pod_id in pending_pods and place_pod(pod_id, allow_preemption=False):
+            print(f"Pending pod {pod_id[:8]}... scheduled on node {pods[pod_id]['node_id'][:8]}...")
 
 def simulate_heartbeats():
     """
     Simulate heartbeat signals from active nodes
     In a real implementation, nodes would send their own heartbeats
     """
-    while True:
+    while not workers_stopped.is_set():
         for node_id, node_info in list(nodes.items()):
             if node_info["status"] == "active":
                 # Update heartbeat for active nodes
                 heartbeats[node_id] = time.time()
                 print(f"Simulated heartbeat from node {node_id[:8]}...")
-        time.sleep(5)  # Send heartbeats every 5 seconds
+        workers_stopped.wait(5)  # Send heartbeats every 5 seconds
 
 def monitor_heartbeats():
     """Monitor node heartbeats and handle recovery of failed nodes"""
-    while True:
-        time.sleep(10)  # Check every 10 seconds
+    while not workers_stopped.wait(10):  # Check every 10 seconds
         current_time = time.time()
         
         for node_id in list(nodes.keys()):
@@ -72,49 +303,132 @@ def monitor_heartbeats():
             if current_time - heartbeats[node_id] > 15:  # Node timeout after 15 seconds
                 print(f"Node {node_id[:8]}... unresponsive. Marking as failed...")
                 
-                # Mark node as failed
-                nodes[node_id]["status"] = "failed"
-                
-                # Get pods running on the failed node
-                failed_pods = nodes[node_id].get("pods", [])
-                
-                # Remove pods from failed node
-                nodes[node_id]["pods"] = []
-                
-                # Attempt to reschedule each pod
-                for pod in failed_pods:
-                    pod_id = pod["pod_id"]
-                    cpu_cores = pod["cpu_cores"]
-                    
-                    print(f"Rescheduling pod {pod_id[:8]}... (CPU: {cpu_cores})...")
-                    
-                    # Try to reschedule the pod
-                    new_node = PodScheduler.select_node(cpu_cores)
-                    if new_node:
-                        # Add pod to new node
-                        nodes[new_node]["pods"].append({"pod_id": pod_id, "cpu_cores": cpu_cores})
-                        # Update pod's node assignment
-                        pods[pod_id]["node_id"] = new_node
-                        pods[pod_id]["status"] = "running"
-                        print(f"Pod {pod_id[:8]}... rescheduled to node {new_node[:8]}...")
-                    else:
-                        # Mark pod as pending if no suitable node found
-                        pods[pod_id]["status"] = "pending"
-                        pods[pod_id]["node_id"] = None
-                        print(f"Pod {pod_id[:8]}... marked as pending - no suitable node found")
-
-# Start the heartbeat simulation and monitoring threads
-heartbeat_sim_thread = threading.Thread(target=simulate_heartbeats, daemon=True)
-heartbeat_sim_thread.start()
-
-heartbeat_monitor_thread = threading.Thread(target=monitor_heartbeats, daemon=True)
-heartbeat_monitor_thread.start()
-
-@app.route("/", methods=["GET"])
+                with cluster_lock:
+                    mark_node_failed(node_id)
+
+def sweep_reservations():
+    """Expire reservations nobody bound, freeing their CPU for pending pods"""
+    while not workers_stopped.wait(1):
+        with cluster_lock:
+            if expire_reservations():
+                retry_pending_pods()
+
+def active_node_containers():
+    """Map container IDs of active nodes to their node IDs"""
+    with cluster_lock:
+        return {
+            node_info["container_id"]: node_id
+            for node_id, node_info in nodes.items()
+            if node_info["status"] == "active"
+        }
+
+def on_container_failure(node_id, reason):
+    """Fail a node as soon as its container is reported dead"""
+    with cluster_lock:
+        if node_id in nodes and mark_node_failed(node_id):
+            print(f"Node {node_id[:8]}... failed: {reason}")
+
+# Periodically consolidate fragmented free CPU with a small migration budget
+def on_pod_migrated(pod_id, source_id, target_id):
+    """Keep indexes and resource versions in step with rebalancer moves"""
+    preemption_index.move(pod_id, target_id)
+    bump_version(nodes[source_id])
+    bump_version(nodes[target_id])
+    bump_version(pods[pod_id])
+
+def after_rebalance():
+    """Freed capacity may now fit pending pods"""
+    with cluster_lock:
+        retry_pending_pods()
+
+rebalancer = Rebalancer(nodes, pods, cluster_lock, max_migrations=5, interval=30,
+                        on_migrate=on_pod_migrated, after_migrations=after_rebalance,
+                        free_of=preemption_index.free)
+
+def start_background_workers():
+    """Start heartbeat simulation/monitoring, the health watcher, the rebalancer and the reservation sweeper"""
+    global health_watcher
+    if background_threads:
+        return  # Already running
+    workers_stopped.clear()
+
+    # Simulated heartbeats only when node containers don't run the real agent
+    targets = [monitor_heartbeats] if NODE_AGENT_API_URL else [simulate_heartbeats, monitor_heartbeats]
+    targets += [lambda: rebalancer.run_forever(workers_stopped), sweep_reservations]
+    for target in targets:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        background_threads.append(thread)
+
+    # Fail nodes from Docker die/oom/stop events, with periodic bulk reconciliation.
+    # The watcher connects to Docker from its own threads, so a slow or missing
+    # daemon never delays startup
+    health_watcher = NodeHealthWatcher(DockerEventSource(get_docker_client), active_node_containers,
+                                       on_container_failure, reconcile_interval=30)
+    health_watcher.start()
+
+def stop_background_workers(timeout=5):
+    """Stop the background workers and wait up to `timeout` seconds for each loop to exit"""
+    global health_watcher
+    workers_stopped.set()
+    if health_watcher is not None:
+        health_watcher.stop(timeout)
+        health_watcher = None
+    for thread in background_threads:
+        thread.join(timeout)
+    background_threads.clear()
+
+def enable_profiling(app, trace_log=None):
+    """
+    Trace scheduler, backend (Docker), lock wait and serialization time per
+    request and mount the /debug/profile sampling endpoint. The span hooks
+    are process-wide, so the most recently created app decides whether they
+    record (see create_app).
+    """
+    global tracer
+    from profiling import RequestTracer, SamplingProfiler, profiling_blueprint
+
+    tracer = RequestTracer(trace_log)
+    tracer.install(app)
+    app.register_blueprint(profiling_blueprint(SamplingProfiler()))
+
+def disable_profiling():
+    """Turn the span hooks back into pass-throughs"""
+    global tracer
+    tracer = None
+
+def create_app(start_workers=True, profiling=None, scheduler_shards=None):
+    """
+    Build the Flask app. Background workers are started only when asked, so
+    tools and benchmarks can serve requests without threads or Docker.
+    Profiling defaults to the API_PROFILING environment variable, and
+    scheduler_shards to API_SCHEDULER_SHARDS.
+    """
+    app = Flask(__name__)
+    shards = API_SCHEDULER_SHARDS if scheduler_shards is None else scheduler_shards
+    if shards:
+        # The workers below act on the in-process scheduler's state, so the
+        # sharded mode runs without them
+        from sharding import ShardedScheduler, sharded_blueprint
+        scheduler = ShardedScheduler(shards)
+        scheduler.start()
+        app.extensions["sharded_scheduler"] = scheduler
+        app.register_blueprint(sharded_blueprint(scheduler, start_node_container))
+        return app
+    app.register_blueprint(api)
+    if API_PROFILING if profiling is None else profiling:
+        enable_profiling(app, API_TRACE_LOG)
+    else:
+        disable_profiling()
+    if start_workers:
+        start_background_workers()
+    return app
+
+@api.route("/", methods=["GET"])
 def index():
     return "API Server is running", 200
 
-@app.route("/nodes", methods=["GET"])
+@api.route("/nodes", methods=["GET"])
 def get_nodes():
     # Add heartbeat information to response
     nodes_info = {}
@@ -123,14 +437,85 @@ def get_nodes():
         if node_id in heartbeats:
             nodes_info[node_id]["last_heartbeat"] = heartbeats[node_id]
             nodes_info[node_id]["heartbeat_age"] = time.time() - heartbeats[node_id]
+        if node_id in node_loads:
+            nodes_info[node_id]["load"] = node_loads[node_id]
     
     return jsonify({"nodes": nodes_info}), 200
 
-@app.route("/pods", methods=["GET"])
+@api.route("/pods", methods=["GET"])
 def get_pods():
     return jsonify({"pods": pods}), 200
 
-@app.route("/node/add", methods=["POST"])
+@api.route("/node/<node_id>", methods=["GET"])
+def get_node(node_id):
+    if node_id not in nodes:
+        return jsonify({"error": "Node not found"}), 404
+    return jsonify({"node_id": node_id, **nodes[node_id]}), 200
+
+@api.route("/pod/<pod_id>", methods=["GET"])
+def get_pod(pod_id):
+    if pod_id not in pods:
+        return jsonify({"error": "Pod not found"}), 404
+    return jsonify({"pod_id": pod_id, **pods[pod_id]}), 200
+
+def heartbeat_aggregator_address():
+    """Address node agents send heartbeats to, starting the shared aggregator on first use"""
+    global _aggregator_address
+    with _aggregator_lock:
+        if _aggregator_address:
+            return _aggregator_address
+        
+        client = get_docker_client()
+        existing = client.containers.list(all=True, filters={"name": f"^{AGGREGATOR_CONTAINER}$"})
+        if existing:
+            if existing[0].status != "running":
+                existing[0].start()
+        else:
+            client.containers.run(
+                image="python:3.8-slim",
+                command="python /agent/agent.py aggregator",
+                detach=True,
+                name=AGGREGATOR_CONTAINER,
+                environment={"API_URL": NODE_AGENT_API_URL},
+                volumes={os.path.abspath(NODE_AGENT_DIR): {"bind": "/agent", "mode": "ro"}},
+                extra_hosts={"host.docker.internal": "host-gateway"},
+                ports={f"{AGGREGATOR_PORT}/udp": AGGREGATOR_PORT},
+                restart_policy={"Name": "unless-stopped"}
+            )
+            print(f"Started heartbeat aggregator on UDP port {AGGREGATOR_PORT}")
+        
+        # Node containers reach the published port through the host
+        _aggregator_address = f"host.docker.internal:{AGGREGATOR_PORT}"
+        return _aggregator_address
+
+def start_node_container(node_id, cpu_cores):
+    """Launch a container to simulate the node"""
+    if NODE_AGENT_API_URL:
+        # Run the heartbeat agent inside the node container, reporting over
+        # UDP to the aggregator, which posts all nodes' heartbeats in one batch
+        agent_options = {
+            "command": f"python /agent/agent.py agent --node-id {node_id}",
+            "environment": {
+                "API_URL": NODE_AGENT_API_URL,
+                "HEARTBEAT_AGGREGATOR": heartbeat_aggregator_address()
+            },
+            "volumes": {os.path.abspath(NODE_AGENT_DIR): {"bind": "/agent", "mode": "ro"}},
+            "extra_hosts": {"host.docker.internal": "host-gateway"}
+        }
+    else:
+        # Run until stopped: the health watcher fails the node if its container exits
+        agent_options = {"command": "sleep infinity"}
+    
+    return get_docker_client().containers.run(
+        image="python:3.8-slim",
+        detach=True,
+        name=f"node_{node_id[:8]}",
+        cpu_period=100000,
+        cpu_quota=int(cpu_cores * 100000),
+        **agent_options
+    )
+
+@api.route("/node/add", methods=["POST"])
 def add_node():
     data = request.get_json()
     cpu_cores = data.get("cpu_cores")
@@ -146,26 +531,26 @@ def add_node():
     node_id = str(uuid.uuid4())
     
     try:
-        # Launch a container to simulate the node
-        container = docker_client.containers.run(
-            image="python:3.8-slim",
-            command="python -c \"import time; time.sleep(3600)\"",
-            detach=True,
-            name=f"node_{node_id[:8]}",
-            cpu_period=100000,
-            cpu_quota=int(cpu_cores * 100000)
-        )
-        
-        # Register the node
-        nodes[node_id] = {
-            "container_id": container.id, 
-            "cpu_cores": cpu_cores, 
-            "status": "active", 
-            "pods": []
-        }
+        with span("backend"):
+            container = start_node_container(node_id, cpu_cores)
         
-        # Initialize heartbeat
-        heartbeats[node_id] = time.time()
+        # Register under the lock: the scheduler, rebalancer and health
+        # watcher iterate `nodes` while holding it
+        with cluster_lock:
+            nodes[node_id] = {
+                "container_id": container.id, 
+                "cpu_cores": cpu_cores, 
+                "status": "active", 
+                "pods": []
+            }
+            bump_version(nodes[node_id])
+            
+            # Initialize heartbeat
+            heartbeats[node_id] = time.time()
+            
+            # New capacity may fit pods that were left pending
+            preemption_index.add_node(node_id, cpu_cores)
+            retry_pending_pods()
         
         print(f"Added new node {node_id[:8]}... with {cpu_cores} CPU cores")
         
@@ -178,17 +563,63 @@ def add_node():
     except Exception as e:
         return jsonify({"error": f"Failed to add node: {str(e)}"}), 500
 
-@app.route("/node/heartbeat/<node_id>", methods=["POST"])
+@api.route("/node/heartbeat/<node_id>", methods=["POST"])
 def node_heartbeat(node_id):
     if node_id in nodes:
         heartbeats[node_id] = time.time()
         return jsonify({"message": "Heartbeat received"}), 200
     return jsonify({"error": "Node not found"}), 404
 
-@app.route("/pod/request", methods=["POST"])
+@api.route("/node/heartbeats", methods=["POST"])
+def node_heartbeats():
+    """
+    Record heartbeats for many nodes in one request. Accepts
+    {"heartbeats": [{"node_id": ..., "load": 0.4}, ...]}; plain node ID
+    strings are accepted in the list too.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    entries = data.get("heartbeats")
+    
+    if not isinstance(entries, list):
+        return jsonify({"error": "Missing 'heartbeats' list"}), 400
+    
+    now = time.time()
+    accepted = 0
+    unknown = []
+    
+    for entry in entries:
+        if isinstance(entry, dict):
+            node_id = entry.get("node_id")
+            load = entry.get("load")
+        else:
+            node_id, load = entry, None
+        
+        if not isinstance(node_id, str) or node_id not in nodes:
+            unknown.append(node_id)
+            continue
+        
+        heartbeats[node_id] = now
+        if isinstance(load, (int, float)):
+            node_loads[node_id] = load
+        accepted += 1
+    
+    return jsonify({"accepted": accepted, "unknown": unknown}), 200
+
+@api.route("/pod/request", methods=["POST"])
 def request_pod():
     data = request.get_json()
     cpu_cores = data.get("cpu_cores")
+    priority = data.get("priority", 0)
+    reservation_id = data.get("reservation_id")
+
+    if cpu_cores is None and reservation_id is not None:
+        # Bind to a reservation using the CPU it holds
+        with cluster_lock:
+            cpu_cores = reservations.get(reservation_id, {}).get("cpu_cores")
+        if cpu_cores is None:
+            return jsonify({"error": "Reservation not found or expired"}), 409
 
     if cpu_cores is None:
         return jsonify({"error": "Missing 'cpu_cores' field"}), 400
@@ -197,27 +628,50 @@ def request_pod():
         cpu_cores = float(cpu_cores)
     except ValueError:
         return jsonify({"error": "CPU cores must be a number"}), 400
-
-    # Use the pod scheduler to select the best node
-    selected_node = PodScheduler.select_node(cpu_cores)
     
-    if selected_node:
+    try:
+        priority = int(priority)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Priority must be an integer"}), 400
+
+    with cluster_lock:
+        expire_reservations()
+        reserved_node = None
+        if reservation_id is not None:
+            reservation = release_reservation(reservation_id)
+            if reservation is None:
+                return jsonify({"error": "Reservation not found or expired"}), 409
+            if cpu_cores > reservation["cpu_cores"]:
+                return jsonify({"error": "Pod needs more CPU than the reservation holds"}), 409
+            reserved_node = reservation["node_id"]
+        
         # Generate pod ID
         pod_id = str(uuid.uuid4())
         
-        # Update node's pod list
-        pod_data = {"pod_id": pod_id, "cpu_cores": cpu_cores}
-        nodes[selected_node]["pods"].append(pod_data)
-        
         # Store pod information for recovery
         pods[pod_id] = {
-            "node_id": selected_node,
+            "node_id": None,
             "cpu_cores": cpu_cores,
-            "status": "running",
+            "priority": priority,
+            "status": "pending",
             "created_at": time.time()  # Track creation time
         }
         
-        print(f"Pod {pod_id[:8]}... scheduled on node {selected_node[:8]}... (CPU: {cpu_cores})")
+        # Use the pod scheduler to select the best node, preempting if needed
+        if reserved_node is None:
+            selected_node = place_pod(pod_id)
+        else:
+            selected_node = place_pod(pod_id, allow_preemption=False, node_id=reserved_node)
+        
+        if selected_node is None:
+            # Nothing was placed, so don't keep the request around
+            pending_pods.discard(pod_id)
+            del pods[pod_id]
+            if reserved_node is not None:
+                return jsonify({"error": "Reserved node can no longer fit the pod"}), 409
+    
+    if selected_node:
+        print(f"Pod {pod_id[:8]}... scheduled on node {selected_node[:8]}... (CPU: {cpu_cores}, priority: {priority})")
         
         return jsonify({
             "message": "Pod scheduled successfully", 
@@ -227,25 +681,40 @@ def request_pod():
     
     return jsonify({"error": "No suitable node found with enough resources"}), 400
 
-@app.route("/pod/remove/<pod_id>", methods=["DELETE"])
+@api.route("/pod/remove/<pod_id>", methods=["DELETE"])
 def remove_pod(pod_id):
-    if pod_id not in pods:
-        return jsonify({"error": "Pod not found"}), 404
-    
-    node_id = pods[pod_id]["node_id"]
-    
-    if node_id in nodes:
-        # Remove pod from node's pod list
-        nodes[node_id]["pods"] = [pod for pod in nodes[node_id]["pods"] if pod["pod_id"] != pod_id]
-    
-    # Remove pod from pods dictionary
-    del pods[pod_id]
+    with cluster_lock:
+        if pod_id not in pods:
+            return jsonify({"error": "Pod not found"}), 404
+        
+        # Conditional delete: only if the pod hasn't changed since the client read it
+        try:
+            version = expected_version()
+        except ValueError:
+            return jsonify({"error": "Resource version must be an integer"}), 400
+        if version is not None and version != pods[pod_id].get("resource_version"):
+            return version_conflict("Pod", pod_id, pods[pod_id])
+        
+        node_id = pods[pod_id]["node_id"]
+        
+        if node_id in nodes:
+            # Remove pod from node's pod list
+            nodes[node_id]["pods"] = [pod for pod in nodes[node_id]["pods"] if pod["pod_id"] != pod_id]
+            bump_version(nodes[node_id])
+        
+        # Remove pod from pods dictionary
+        del pods[pod_id]
+        pending_pods.discard(pod_id)
+        preemption_index.remove(pod_id)
+        
+        # Freed capacity may fit pods that were left pending
+        retry_pending_pods()
     
     print(f"Pod {pod_id[:8]}... removed successfully")
     
     return jsonify({"message": f"Pod {pod_id} removed successfully"}), 200
 
-@app.route("/cluster/status", methods=["GET"])
+@api.route("/cluster/status", methods=["GET"])
 def cluster_status():
     """Get overall cluster status including resources"""
     total_cpu = 0
@@ -276,48 +745,106 @@ def cluster_status():
     }), 200
 
 # For testing: Endpoint to manually fail a node
-@app.route("/node/fail/<node_id>", methods=["POST"])
+@api.route("/node/fail/<node_id>", methods=["POST"])
 def fail_node(node_id):
     if node_id not in nodes:
         return jsonify({"error": "Node not found"}), 404
     
-    if nodes[node_id]["status"] == "failed":
-        return jsonify({"message": "Node is already marked as failed"}), 200
+    with cluster_lock:
+        # Conditional failure: only if the node hasn't changed since the client read it
+        try:
+            version = expected_version()
+        except ValueError:
+            return jsonify({"error": "Resource version must be an integer"}), 400
+        if version is not None and version != nodes[node_id].get("resource_version"):
+            return version_conflict("Node", node_id, nodes[node_id])
+        
+        if nodes[node_id]["status"] == "failed":
+            return jsonify({"message": "Node is already marked as failed"}), 200
+        
+        print(f"Manually failing node {node_id[:8]}...")
+        mark_node_failed(node_id)
     
-    # Mark node as failed
-    nodes[node_id]["status"] = "failed"
+    return jsonify({"message": f"Node {node_id} marked as failed and pods rescheduled"}), 200
+
+@api.route("/reservation", methods=["POST"])
+def create_reservation():
+    """Hold CPU on a node for a short time so a later /pod/request can bind to it"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    cpu_cores = data.get("cpu_cores")
+    ttl = data.get("ttl", 5)
     
-    print(f"Manually failing node {node_id[:8]}...")
+    if cpu_cores is None:
+        return jsonify({"error": "Missing 'cpu_cores' field"}), 400
     
-    # Get pods running on the failed node
-    failed_pods = nodes[node_id].get("pods", [])
+    try:
+        cpu_cores = float(cpu_cores)
+        ttl = float(ttl)
+    except (TypeError, ValueError):
+        return jsonify({"error": "CPU cores and ttl must be numbers"}), 400
     
-    # Remove pods from failed node
-    nodes[node_id]["pods"] = []
+    if ttl <= 0 or ttl > 60:
+        return jsonify({"error": "ttl must be between 0 and 60 seconds"}), 400
     
-    # Attempt to reschedule each pod
-    for pod in failed_pods:
-        pod_id = pod["pod_id"]
-        cpu_cores = pod["cpu_cores"]
+    with cluster_lock:
+        expire_reservations()
+        node_id = PodScheduler.select_node(cpu_cores)
+        if node_id is None:
+            return jsonify({"error": "No suitable node found with enough resources"}), 400
         
-        print(f"Rescheduling pod {pod_id[:8]}... (CPU: {cpu_cores})...")
-        
-        # Try to reschedule the pod
-        new_node = PodScheduler.select_node(cpu_cores)
-        if new_node:
-            # Add pod to new node
-            nodes[new_node]["pods"].append({"pod_id": pod_id, "cpu_cores": cpu_cores})
-            # Update pod's node assignment
-            pods[pod_id]["node_id"] = new_node
-            pods[pod_id]["status"] = "running"
-            print(f"Pod {pod_id[:8]}... rescheduled to node {new_node[:8]}...")
-        else:
-            # Mark pod as pending if no suitable node found
-            pods[pod_id]["status"] = "pending"
-            pods[pod_id]["node_id"] = None
-            print(f"Pod {pod_id[:8]}... marked as pending - no suitable node found")
+        reservation_id = str(uuid.uuid4())
+        reservations[reservation_id] = {
+            "node_id": node_id,
+            "cpu_cores": cpu_cores,
+            "expires_at": time.time() + ttl
+        }
+        reserved_cpu[node_id] = reserved_cpu.get(node_id, 0.0) + cpu_cores
+        preemption_index.set_reserved(node_id, reserved_cpu[node_id])
+        node_version = nodes[node_id].get("resource_version")
+        expires_at = reservations[reservation_id]["expires_at"]
     
-    return jsonify({"message": f"Node {node_id} marked as failed and pods rescheduled"}), 200
+    return jsonify({
+        "reservation_id": reservation_id,
+        "node_id": node_id,
+        "node_resource_version": node_version,
+        "expires_at": expires_at
+    }), 200
+
+@api.route("/reservation/<reservation_id>", methods=["DELETE"])
+def delete_reservation(reservation_id):
+    with cluster_lock:
+        if release_reservation(reservation_id) is None:
+            return jsonify({"error": "Reservation not found or expired"}), 404
+    return jsonify({"message": f"Reservation {reservation_id} released"}), 200
+
+@api.route("/cluster/rebalance", methods=["POST"])
+def trigger_rebalance():
+    """Run one rebalancing cycle on demand"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    max_migrations = data.get("max_migrations")
+    
+    if max_migrations is not None:
+        try:
+            max_migrations = int(max_migrations)
+        except (TypeError, ValueError):
+            return jsonify({"error": "max_migrations must be an integer"}), 400
+        if max_migrations < 0:
+            return jsonify({"error": "max_migrations must not be negative"}), 400
+    
+    report = rebalancer.run_cycle(max_migrations)
+    return jsonify(report), 200
+
+@api.route("/cluster/rebalance", methods=["GET"])
+def rebalance_status():
+    """Report the result of the last rebalancing cycle"""
+    return jsonify({"last_report": rebalancer.last_report}), 200
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
\ No newline at end of file
+    # With the debug reloader, the watching parent process only restarts the
+    # server; workers run in the serving child
+    create_app(start_workers=os.environ.get("WERKZEUG_RUN_MAIN") == "true").run(
+        host="0.0.0.0", port=8000, debug=True)
\ No newline at end of file
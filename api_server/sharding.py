@@ -0,0 +1,459 @@
+"""
+Sharded scheduler: nodes are partitioned across worker processes that each
+own their shard's capacity state.
+
+The API server runs on it when started with API_SCHEDULER_SHARDS=N (or
+create_app(scheduler_shards=N)); sharded_blueprint() then replaces the
+regular routes. That mode only places pods by CPU: priorities, preemption,
+reservations and resource versions need a cluster-wide view of every node
+and pod, which is exactly what the shards split up, so requests using them
+are rejected. Node failures come from POST /node/fail only.
+
+The scheduler can also be driven directly:
+
+    scheduler = ShardedScheduler(4)
+    scheduler.start()
+    scheduler.add_node(16)
+    pod_id, node_id = scheduler.request_pod(2)
+
+or run `python sharding.py` to measure placement throughput.
+"""
+import multiprocessing
+import threading
+import time
+import uuid
+
+from flask import Blueprint, jsonify, request
+
+from rebalancer import best_fit
+
+
+def shard_worker(conn):
+    """
+    Scheduler worker process owning the capacity state of one shard of nodes.
+    Receives (op, args) tuples on `conn` and replies with one result each.
+    """
+    nodes = {}  # node_id -> {"cpu_cores", "free", "status", "pods": {pod_id: cpu_cores}}
+    pod_nodes = {}  # pod_id -> node_id
+
+    def select_node(cpu_cores):
+        # Same best-fit as PodScheduler.select_node, on cached free CPU
+        return best_fit(((node_id, node_info["free"]) for node_id, node_info in nodes.items()
+                         if node_info["status"] == "active"), cpu_cores)
+
+    def place(pod_id, cpu_cores):
+        node_id = select_node(cpu_cores)
+        if node_id:
+            nodes[node_id]["pods"][pod_id] = cpu_cores
+            nodes[node_id]["free"] -= cpu_cores
+            pod_nodes[pod_id] = node_id
+        return node_id
+
+    def status():
+        active = [n for n in nodes.values() if n["status"] == "active"]
+        return {
+            "nodes": len(nodes),
+            "active_nodes": len(active),
+            "pods": len(pod_nodes),
+            "total_cpu": sum(n["cpu_cores"] for n in active),
+            "free_cpu": sum(n["free"] for n in active),
+            "largest_free": max((n["free"] for n in active), default=0.0)
+        }
+
+    while True:
+        op, args = conn.recv()
+
+        if op == "add_node":
+            node_id, cpu_cores = args
+            nodes[node_id] = {"cpu_cores": cpu_cores, "free": cpu_cores, "status": "active", "pods": {}}
+            result = status()
+        elif op == "place":
+            result = [place(pod_id, cpu_cores) for pod_id, cpu_cores in args]
+        elif op == "remove":
+            node_id = pod_nodes.pop(args, None)
+            if node_id:
+                nodes[node_id]["free"] += nodes[node_id]["pods"].pop(args)
+            result = node_id
+        elif op == "fail_node":
+            # Reschedule inside the shard; pods that don't fit are returned unplaced
+            node_info = nodes.get(args)
+            result = []
+            if node_info and node_info["status"] == "active":
+                node_info["status"] = "failed"
+                failed_pods = node_info["pods"]
+                node_info["pods"] = {}
+                node_info["free"] = node_info["cpu_cores"]
+                for pod_id, cpu_cores in failed_pods.items():
+                    pod_nodes.pop(pod_id, None)
+                    result.append((pod_id, cpu_cores, place(pod_id, cpu_cores)))
+        elif op == "status":
+            result = status()
+        elif op == "nodes":
+            result = nodes
+        elif op == "stop":
+            conn.send(None)
+            break
+        else:
+            result = None
+
+        conn.send(result)
+
+
+class Shard:
+    """Front-end handle for one worker process"""
+
+    def __init__(self, index, context):
+        self.index = index
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=shard_worker, args=(child_conn,), daemon=True)
+        self.lock = threading.Lock()  # One outstanding request per pipe
+        self.total_cpu = 0.0
+        self.free_cpu = 0.0
+        self.largest_free = 0.0
+
+    def call(self, op, args=None):
+        with self.lock:
+            self.conn.send((op, args))
+            return self.conn.recv()
+
+    def update(self, status):
+        self.total_cpu = status["total_cpu"]
+        self.free_cpu = status["free_cpu"]
+        self.largest_free = status["largest_free"]
+
+
+class ShardedScheduler:
+    """
+    Sharded control plane: nodes are partitioned across a pool of scheduler
+    worker processes, each owning its shard's capacity state. Pod requests go
+    to the preferred shard and fall back to the others when it is full.
+
+    Pods no shard can fit, whether new or displaced by a node failure, are
+    kept as pending, like the API server does, and retried on the shard that
+    gains capacity when a node is added or a pod removed.
+    """
+
+    def __init__(self, num_workers=None):
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        context = multiprocessing.get_context("spawn")
+        self.shards = [Shard(i, context) for i in range(self.num_workers)]
+        self.node_shards = {}  # node_id -> shard index
+        self.pod_shards = {}   # pod_id -> shard index
+        self.pending = {}      # pod_id -> cpu_cores of pods waiting for capacity
+        self.lock = threading.Lock()  # Guards the routing tables
+        self._retry_shards = set()  # Shards with new capacity to offer pending pods
+        self._retrying = False
+        self._next_shard = 0
+
+    def start(self):
+        for shard in self.shards:
+            shard.process.start()
+
+    def stop(self):
+        for shard in self.shards:
+            try:
+                shard.call("stop")
+            except (EOFError, OSError):
+                pass
+            shard.process.join(timeout=5)
+
+    def add_node(self, cpu_cores, node_id=None):
+        """Add a node to the shard with the least total capacity"""
+        node_id = node_id or str(uuid.uuid4())
+        with self.lock:
+            shard = min(self.shards, key=lambda s: s.total_cpu)
+            shard.total_cpu += float(cpu_cores)  # Reserve so concurrent adds spread out
+            self.node_shards[node_id] = shard.index
+        shard.update(shard.call("add_node", (node_id, float(cpu_cores))))
+        self._retry_pending(shard)
+        return node_id
+
+    def _retry_pending(self, shard):
+        """
+        Offer all pending pods, in one batch, to a shard that gained capacity.
+        One thread runs retries at a time; shards that gain capacity meanwhile
+        are queued for it, so no pod is offered to two shards at once and no
+        freed capacity is skipped while the pods are out of `pending`.
+        """
+        with self.lock:
+            self._retry_shards.add(shard.index)
+            if self._retrying:
+                return
+            self._retrying = True
+        while True:
+            with self.lock:
+                if not self._retry_shards or not self.pending:
+                    self._retry_shards.clear()
+                    self._retrying = False
+                    return
+                shard = self.shards[self._retry_shards.pop()]
+                batch = list(self.pending.items())
+                self.pending.clear()
+            placed = shard.call("place", batch)
+            with self.lock:
+                for (pod_id, cpu_cores), node_id in zip(batch, placed):
+                    if node_id:
+                        self.pod_shards[pod_id] = shard.index
+                    else:
+                        self.pending[pod_id] = cpu_cores
+            shard.update(shard.call("status"))
+
+    def _preferred_order(self):
+        """Round-robin preferred shard, then the rest by largest free slot"""
+        with self.lock:
+            preferred = self.shards[self._next_shard]
+            self._next_shard = (self._next_shard + 1) % len(self.shards)
+        others = sorted((s for s in self.shards if s is not preferred),
+                        key=lambda s: s.largest_free, reverse=True)
+        return [preferred] + others
+
+    def request_pod(self, cpu_cores, pod_id=None, keep_pending=True):
+        """
+        Place one pod, returning (pod_id, node_id) or (pod_id, None) if no
+        shard fits it. The pod is then left pending unless `keep_pending` is False.
+        """
+        pod_id = pod_id or str(uuid.uuid4())
+        node_id = self._place_with_fallback(pod_id, float(cpu_cores), keep_pending=keep_pending)
+        return pod_id, node_id
+
+    def _place_with_fallback(self, pod_id, cpu_cores, exclude=None, keep_pending=True):
+        for shard in self._preferred_order():
+            if shard is exclude:
+                continue
+            node_id = shard.call("place", [(pod_id, cpu_cores)])[0]
+            if node_id:
+                with self.lock:
+                    self.pod_shards[pod_id] = shard.index
+                return node_id
+        if keep_pending:
+            with self.lock:
+                self.pending[pod_id] = cpu_cores
+        return None
+
+    def request_pods(self, cpu_requirements):
+        """
+        Place many pods, fanning batches out to all shards in parallel.
+        Pods a shard cannot fit fall back to the other shards one by one.
+        Returns a list of (pod_id, node_id or None) in request order.
+        """
+        batches = [[] for _ in self.shards]
+        for i, cpu_cores in enumerate(cpu_requirements):
+            batches[i % len(self.shards)].append((str(uuid.uuid4()), float(cpu_cores)))
+
+        results = {}
+
+        def run_batch(shard, batch):
+            if batch:
+                results[shard.index] = shard.call("place", batch)
+
+        threads = [threading.Thread(target=run_batch, args=(shard, batch))
+                   for shard, batch in zip(self.shards, batches)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for shard in self.shards:
+            shard.update(shard.call("status"))
+
+        placed = [None] * len(cpu_requirements)
+        for shard, batch in zip(self.shards, batches):
+            for j, ((pod_id, cpu_cores), node_id) in enumerate(zip(batch, results.get(shard.index, []))):
+                if node_id is None:
+                    node_id = self._place_with_fallback(pod_id, cpu_cores, exclude=shard)
+                else:
+                    with self.lock:
+                        self.pod_shards[pod_id] = shard.index
+                placed[j * len(self.shards) + shard.index] = (pod_id, node_id)
+        return placed
+
+    def remove_pod(self, pod_id):
+        with self.lock:
+            if self.pending.pop(pod_id, None) is not None:
+                return True
+            index = self.pod_shards.pop(pod_id, None)
+        if index is None:
+            return False
+        shard = self.shards[index]
+        removed = shard.call("remove", pod_id) is not None
+        if removed:
+            self._retry_pending(shard)
+        return removed
+
+    def fail_node(self, node_id):
+        """
+        Fail a node inside its shard. Pods the shard cannot reschedule fall
+        back to other shards, and those that fit nowhere become pending.
+        Returns a list of (pod_id, node_id or None).
+        """
+        index = self.node_shards.get(node_id)
+        if index is None:
+            return None
+        shard = self.shards[index]
+        outcomes = []
+        for pod_id, cpu_cores, new_node in shard.call("fail_node", node_id):
+            if new_node is None:
+                with self.lock:
+                    self.pod_shards.pop(pod_id, None)
+                new_node = self._place_with_fallback(pod_id, cpu_cores, exclude=shard)
+            outcomes.append((pod_id, new_node))
+        shard.update(shard.call("status"))
+        return outcomes
+
+    def status(self):
+        statuses = [shard.call("status") for shard in self.shards]
+        for shard, status in zip(self.shards, statuses):
+            shard.update(status)
+        return statuses
+
+    def nodes(self):
+        """All nodes across shards: node_id -> {"cpu_cores", "free", "status", "pods"}"""
+        merged = {}
+        for shard in self.shards:
+            merged.update(shard.call("nodes"))
+        return merged
+
+
+def sharded_blueprint(scheduler, start_container):
+    """
+    API routes backed by a ShardedScheduler, mirroring the regular ones.
+    `start_container(node_id, cpu_cores)` launches a node's container.
+    """
+    api = Blueprint("sharded_api", __name__)
+
+    def json_body():
+        data = request.get_json(silent=True)
+        return data if isinstance(data, dict) else None
+
+    @api.route("/", methods=["GET"])
+    def index():
+        return f"API Server is running (sharded scheduler, {scheduler.num_workers} workers)", 200
+
+    @api.route("/nodes", methods=["GET"])
+    def get_nodes():
+        nodes_info = {
+            node_id: {
+                "cpu_cores": node_info["cpu_cores"],
+                "status": node_info["status"],
+                "pods": [{"pod_id": pod_id, "cpu_cores": cpu} for pod_id, cpu in node_info["pods"].items()]
+            }
+            for node_id, node_info in scheduler.nodes().items()
+        }
+        return jsonify({"nodes": nodes_info}), 200
+
+    @api.route("/pods", methods=["GET"])
+    def get_pods():
+        pods_info = {}
+        for node_id, node_info in scheduler.nodes().items():
+            for pod_id, cpu in node_info["pods"].items():
+                pods_info[pod_id] = {"node_id": node_id, "cpu_cores": cpu, "status": "running"}
+        with scheduler.lock:
+            pending = dict(scheduler.pending)
+        for pod_id, cpu in pending.items():
+            pods_info[pod_id] = {"node_id": None, "cpu_cores": cpu, "status": "pending"}
+        return jsonify({"pods": pods_info}), 200
+
+    @api.route("/node/add", methods=["POST"])
+    def add_node():
+        data = json_body()
+        if data is None or not data.get("cpu_cores"):
+            return jsonify({"error": "Missing CPU cores specification"}), 400
+        try:
+            cpu_cores = float(data["cpu_cores"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "CPU cores must be a number"}), 400
+
+        node_id = str(uuid.uuid4())
+        try:
+            container = start_container(node_id, cpu_cores)
+        except Exception as e:
+            return jsonify({"error": f"Failed to add node: {str(e)}"}), 500
+        scheduler.add_node(cpu_cores, node_id)
+        return jsonify({
+            "message": "Node added successfully",
+            "node_id": node_id,
+            "container_id": container.id
+        }), 200
+
+    @api.route("/pod/request", methods=["POST"])
+    def request_pod():
+        data = json_body()
+        if data is None or data.get("cpu_cores") is None:
+            return jsonify({"error": "Missing 'cpu_cores' field"}), 400
+        if data.get("priority", 0) or data.get("reservation_id") is not None:
+            return jsonify({"error": "Priorities and reservations are not supported by the sharded scheduler"}), 400
+        try:
+            cpu_cores = float(data["cpu_cores"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "CPU cores must be a number"}), 400
+
+        # Like the regular API, a new pod that fits nowhere isn't kept
+        pod_id, node_id = scheduler.request_pod(cpu_cores, keep_pending=False)
+        if node_id is None:
+            return jsonify({"error": "No suitable node found with enough resources"}), 400
+        return jsonify({"message": "Pod scheduled successfully", "node_id": node_id, "pod_id": pod_id}), 200
+
+    @api.route("/pod/remove/<pod_id>", methods=["DELETE"])
+    def remove_pod(pod_id):
+        if not scheduler.remove_pod(pod_id):
+            return jsonify({"error": "Pod not found"}), 404
+        return jsonify({"message": f"Pod {pod_id} removed successfully"}), 200
+
+    @api.route("/node/fail/<node_id>", methods=["POST"])
+    def fail_node(node_id):
+        outcomes = scheduler.fail_node(node_id)
+        if outcomes is None:
+            return jsonify({"error": "Node not found"}), 404
+        return jsonify({
+            "message": f"Node {node_id} marked as failed and pods rescheduled",
+            "rescheduled": sum(1 for _, new_node in outcomes if new_node),
+            "pending": sum(1 for _, new_node in outcomes if new_node is None)
+        }), 200
+
+    @api.route("/cluster/status", methods=["GET"])
+    def cluster_status():
+        statuses = scheduler.status()
+        total_cpu = sum(status["total_cpu"] for status in statuses)
+        used_cpu = total_cpu - sum(status["free_cpu"] for status in statuses)
+        active_nodes = sum(status["active_nodes"] for status in statuses)
+        with scheduler.lock:
+            pending = len(scheduler.pending)
+        return jsonify({
+            "active_nodes": active_nodes,
+            "failed_nodes": sum(status["nodes"] for status in statuses) - active_nodes,
+            "total_pods": sum(status["pods"] for status in statuses) + pending,
+            "total_cpu": total_cpu,
+            "used_cpu": used_cpu,
+            "available_cpu": total_cpu - used_cpu,
+            "utilization_percentage": (used_cpu / total_cpu * 100) if total_cpu > 0 else 0,
+            "shards": statuses
+        }), 200
+
+    return api
+
+
+def benchmark(worker_counts=(1, 2, 4, 8), num_nodes=2000, num_pods=20000, batch_size=500):
+    """Measure placement throughput for each worker count"""
+    for num_workers in worker_counts:
+        scheduler = ShardedScheduler(num_workers)
+        scheduler.start()
+        try:
+            for _ in range(num_nodes):
+                scheduler.add_node(16)
+
+            started = time.perf_counter()
+            placed = 0
+            for i in range(0, num_pods, batch_size):
+                results = scheduler.request_pods([1 + (j % 4) * 0.5 for j in range(i, min(i + batch_size, num_pods))])
+                placed += sum(1 for _, node_id in results if node_id)
+            elapsed = time.perf_counter() - started
+
+            print(f"{num_workers} worker(s): {placed}/{num_pods} pods placed in {elapsed:.2f}s "
+                  f"({placed / elapsed:.0f} placements/s)")
+        finally:
+            scheduler.stop()
+
+
+if __name__ == "__main__":
+    print(f"Placement throughput on {multiprocessing.cpu_count()} CPU(s)")
+    benchmark()
@@ -0,0 +1,78 @@
+import threading
+
+from health import FakeEventSource, NodeHealthWatcher
+
+
+def make_watcher(source, containers, reconcile_interval=60):
+    failures = []
+    failed = threading.Event()
+
+    def on_failure(node_id, reason):
+        failures.append((node_id, reason))
+        failed.set()
+
+    watcher = NodeHealthWatcher(source, lambda: dict(containers), on_failure, reconcile_interval)
+    return watcher, failures, failed
+
+
+def test_failure_event_fails_node():
+    source = FakeEventSource()
+    source.start_container("c1")
+    source.start_container("c2")
+    watcher, failures, failed = make_watcher(source, {"c1": "n1", "c2": "n2"})
+    watcher.start()
+    try:
+        source.emit("c1", "oom")
+        assert failed.wait(2)
+        assert failures == [("n1", "container oom")]
+    finally:
+        watcher.stop(timeout=2)
+
+
+def test_events_for_unknown_containers_are_ignored():
+    source = FakeEventSource()
+    source.start_container("c1")
+    watcher, failures, failed = make_watcher(source, {"c1": "n1"})
+    watcher.start()
+    try:
+        source.emit("other", "die")
+        source.emit("c1", "die")
+        assert failed.wait(2)
+        assert failures == [("n1", "container die")]
+    finally:
+        watcher.stop(timeout=2)
+
+
+def test_reconcile_catches_missed_events():
+    source = FakeEventSource()
+    source.start_container("c1")
+    source.start_container("c2")
+    watcher, failures, _ = make_watcher(source, {"c1": "n1", "c2": "n2"})
+
+    source.kill_silently("c2")
+    assert watcher.reconcile() == ["n2"]
+    assert failures == [("n2", "container not running")]
+
+
+def test_reconcile_loop_runs_periodically():
+    source = FakeEventSource()
+    source.start_container("c1")
+    watcher, failures, failed = make_watcher(source, {"c1": "n1"}, reconcile_interval=0.05)
+    watcher.start()
+    try:
+        source.kill_silently("c1")
+        assert failed.wait(2)
+        assert failures[0] == ("n1", "container not running")
+    finally:
+        watcher.stop(timeout=2)
+
+
+def test_stop_joins_both_threads():
+    source = FakeEventSource()
+    watcher, _, _ = make_watcher(source, {})
+    watcher.start()
+    threads = list(watcher._threads)
+    assert len(threads) == 2 and all(thread.is_alive() for thread in threads)
+
+    watcher.stop(timeout=2)
+    assert not any(thread.is_alive() for thread in threads)
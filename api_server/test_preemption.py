@@ -0,0 +1,121 @@
+import random
+
+from preemption import PreemptionIndex
+
+
+def brute_force_victims(index, pods, capacity, cpu_cores, priority):
+    """Reference search: try every node at every level, no index"""
+    def free(node_id):
+        return capacity[node_id] - sum(cpu for node, _, cpu in pods.values() if node == node_id)
+
+    for level in sorted({p for _, p, _ in pods.values()}):
+        if level >= priority:
+            break
+        best = None
+        for node_id in capacity:
+            reclaimable = sum(cpu for node, p, cpu in pods.values() if node == node_id and p <= level)
+            if reclaimable == 0 or free(node_id) + reclaimable < cpu_cores:
+                continue
+            victims = index._victims_on_node(node_id, cpu_cores - free(node_id), level)
+            cost = (len(victims), sum(cpu for _, cpu in victims))
+            if best is None or cost < best[0]:
+                best = (cost, level)
+        if best is not None:
+            return best
+    return None
+
+
+def test_prefers_single_victim_over_tight_fit():
+    index = PreemptionIndex()
+    for n in range(100):
+        node_id = f"a{n:03d}"
+        index.add_node(node_id, 4.0)
+        for j in range(8):
+            index.add(f"{node_id}-{j}", node_id, 0, 0.5)
+    index.add_node("big", 10.0)
+    index.add("big-large", "big", 0, 4.0)
+    index.add("big-critical", "big", 9, 6.0)
+
+    assert index.find_victims(4.0, 5) == ("big", ["big-large"])
+
+
+def test_no_victims_at_or_above_priority():
+    index = PreemptionIndex()
+    index.add_node("n1", 2.0)
+    index.add("p1", "n1", 5, 2.0)
+    assert index.find_victims(1.0, 5) == (None, [])
+    assert index.find_victims(1.0, 6) == ("n1", ["p1"])
+
+
+def test_reserved_cpu_is_not_reclaimable():
+    index = PreemptionIndex()
+    index.add_node("n1", 4.0)
+    index.add("p1", "n1", 0, 2.0)
+    index.set_reserved("n1", 2.0)
+    assert index.find_victims(4.0, 5) == (None, [])
+    index.set_reserved("n1", 0)
+    assert index.find_victims(4.0, 5) == ("n1", ["p1"])
+
+
+def test_matches_brute_force_search():
+    rng = random.Random(3)
+    compared = 0
+    for _ in range(2000):
+        index = PreemptionIndex()
+        capacity = {}
+        pods = {}  # pod_id -> (node_id, priority, cpu_cores)
+
+        def used(node_id):
+            return sum(cpu for node, _, cpu in pods.values() if node == node_id)
+
+        for n in range(rng.randint(1, 20)):
+            capacity[f"n{n}"] = rng.choice([2.0, 4.0, 8.0])
+            index.add_node(f"n{n}", capacity[f"n{n}"])
+        for i in range(rng.randint(0, 80)):
+            node_id = rng.choice(list(capacity))
+            cpu = rng.choice([0.5, 1.0, 1.5, 3.0])
+            if used(node_id) + cpu > capacity[node_id]:
+                continue
+            pods[f"p{i}"] = (node_id, rng.randint(0, 3), cpu)
+            index.add(f"p{i}", node_id, pods[f"p{i}"][1], cpu)
+        for pod_id in rng.sample(list(pods), len(pods) // 4):
+            index.remove(pod_id)
+            del pods[pod_id]
+        for pod_id in rng.sample(list(pods), len(pods) // 5):
+            target = rng.choice(list(capacity))
+            node_id, priority, cpu = pods[pod_id]
+            if target != node_id and used(target) + cpu <= capacity[target]:
+                index.move(pod_id, target)
+                pods[pod_id] = (target, priority, cpu)
+        if rng.random() < 0.3:
+            dead = rng.choice(list(capacity))
+            index.remove_node(dead)
+            for pod_id, (node_id, _, _) in list(pods.items()):
+                if node_id == dead:
+                    index.remove(pod_id)
+                    del pods[pod_id]
+            del capacity[dead]
+
+        for node_id in capacity:
+            assert abs(index.free(node_id) - (capacity[node_id] - used(node_id))) < 1e-9
+
+        cpu_cores = rng.choice([1.0, 2.0, 3.0, 4.0, 6.0])
+        priority = rng.randint(0, 4)
+        if any(capacity[n] - used(n) >= cpu_cores for n in capacity):
+            continue  # select_node would place it without preemption
+
+        node_id, victims = index.find_victims(cpu_cores, priority)
+        expected = brute_force_victims(index, pods, capacity, cpu_cores, priority)
+        assert (node_id is None) == (expected is None)
+        if node_id is None:
+            continue
+
+        compared += 1
+        (count, evicted), level = expected
+        assert all(pods[v][0] == node_id and pods[v][1] <= level for v in victims)
+        assert max(pods[v][1] for v in victims) <= level
+        assert capacity[node_id] - used(node_id) + sum(pods[v][2] for v in victims) >= cpu_cores
+        # Fewer nodes than MAX_CANDIDATES, so the cheapest plan is always found
+        assert (len(victims), sum(pods[v][2] for v in victims)) == (count, evicted)
+
+    assert compared > 100
@@ -0,0 +1,22 @@
+import server
+
+
+def span_names(response):
+    return {entry.split(";")[0] for entry in response.headers.get("Server-Timing", "").split(", ") if entry}
+
+
+def test_span_hooks_trace_only_while_profiling(cluster):
+    client = server.create_app(start_workers=False, profiling=True).test_client()
+    assert server.rebalancer.lock is server.cluster_lock
+    assert span_names(client.post("/node/add", json={"cpu_cores": 4})) >= {"backend", "lock_wait", "serialize", "total"}
+    assert span_names(client.post("/pod/request", json={"cpu_cores": 1})) >= {"scheduler", "lock_wait", "serialize"}
+
+    client = server.create_app(start_workers=False, profiling=False).test_client()
+    assert server.tracer is None
+    response = client.post("/pod/request", json={"cpu_cores": 1})
+    assert response.status_code == 200 and "Server-Timing" not in response.headers
+
+
+def test_profile_endpoint_rejects_non_object_body(cluster):
+    client = server.create_app(start_workers=False, profiling=True).test_client()
+    assert client.post("/debug/profile", json=[1]).status_code == 400
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def client(cluster):
+    return server.create_app(start_workers=False, profiling=False).test_client()
+
+
+def test_expired_reservation_frees_cpu_for_placement(client):
+    assert client.post("/node/add", json={"cpu_cores": 4}).status_code == 200
+    assert client.post("/reservation", json={"cpu_cores": 3, "ttl": 0.1}).status_code == 200
+    assert client.post("/pod/request", json={"cpu_cores": 2}).status_code == 400
+
+    time.sleep(0.3)
+    response = client.post("/pod/request", json={"cpu_cores": 2})
+    assert response.status_code == 200
+    assert server.reservations == {} and server.reserved_cpu == {}
+
+
+def test_expired_reservation_cannot_be_bound(client):
+    client.post("/node/add", json={"cpu_cores": 4})
+    reservation_id = client.post("/reservation", json={"cpu_cores": 2, "ttl": 0.1}).get_json()["reservation_id"]
+
+    time.sleep(0.3)
+    response = client.post("/pod/request", json={"reservation_id": reservation_id})
+    assert response.status_code == 409
@@ -0,0 +1,6 @@
+"""Python client SDK for the cluster simulation API server."""
+from .errors import ApiError, ConflictError
+from .sync_client import ClusterClient
+from .async_client import AsyncClusterClient
+
+__all__ = ["ApiError", "ConflictError", "ClusterClient", "AsyncClusterClient"]
@@ -0,0 +1,159 @@
+import asyncio
+
+from .errors import RETRY_STATUSES, backoff_delays, is_idempotent, raise_for_payload
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for the asyncio client
+    aiohttp = None
+
+
+class AsyncClusterClient:
+    """
+    asyncio client for the cluster API server, mirroring ClusterClient.
+
+    Requests share one aiohttp connection pool, and a semaphore caps how many
+    are in flight at once, so bulk helpers can fire thousands of requests
+    without overrunning the server. Use it as an async context manager.
+    """
+
+    def __init__(self, base_url="http://localhost:8000", max_concurrency=64, retries=3,
+                 backoff=0.1, timeout=10):
+        if aiohttp is None:
+            raise ImportError("AsyncClusterClient requires aiohttp (pip install aiohttp)")
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, endpoint, json=None, headers=None, idempotent=None):
+        """
+        Send a request, retrying transient failures, and return the decoded JSON.
+        Non-idempotent requests are only retried if the connection failed.
+        """
+        await self.open()
+        if idempotent is None:
+            idempotent = is_idempotent(method, headers)
+        delays = backoff_delays(self.retries, self.backoff)
+        while True:
+            try:
+                async with self._semaphore:
+                    async with self.session.request(method, f"{self.base_url}{endpoint}", json=json,
+                                                    headers=headers) as response:
+                        status = response.status
+                        try:
+                            payload = await response.json(content_type=None)
+                        except ValueError:
+                            payload = {"error": await response.text()}
+            except aiohttp.ClientConnectionError as e:
+                # ClientConnectorError: the request was never sent
+                retryable = idempotent or isinstance(e, aiohttp.ClientConnectorError)
+                delay = next(delays, None) if retryable else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            if idempotent and status in RETRY_STATUSES:
+                delay = next(delays, None)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+
+            raise_for_payload(status, payload)
+            return payload
+
+    # --- Reads ---
+
+    async def health(self):
+        """True if the server answers; False if it is down or unreachable"""
+        await self.open()
+        try:
+            async with self.session.get(f"{self.base_url}/") as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def nodes(self):
+        return (await self.request("GET", "/nodes"))["nodes"]
+
+    async def pods(self):
+        return (await self.request("GET", "/pods"))["pods"]
+
+    async def node(self, node_id):
+        return await self.request("GET", f"/node/{node_id}")
+
+    async def pod(self, pod_id):
+        return await self.request("GET", f"/pod/{pod_id}")
+
+    async def cluster_status(self):
+        return await self.request("GET", "/cluster/status")
+
+    # --- Mutations ---
+
+    async def add_node(self, cpu_cores):
+        return await self.request("POST", "/node/add", json={"cpu_cores": cpu_cores})
+
+    async def fail_node(self, node_id, resource_version=None):
+        headers = {"If-Match": str(resource_version)} if resource_version is not None else None
+        return await self.request("POST", f"/node/fail/{node_id}", headers=headers)
+
+    async def request_pod(self, cpu_cores, priority=0, reservation_id=None):
+        body = {"cpu_cores": cpu_cores, "priority": priority}
+        if reservation_id is not None:
+            body["reservation_id"] = reservation_id
+        return await self.request("POST", "/pod/request", json=body)
+
+    async def remove_pod(self, pod_id, resource_version=None):
+        headers = {"If-Match": str(resource_version)} if resource_version is not None else None
+        return await self.request("DELETE", f"/pod/remove/{pod_id}", headers=headers)
+
+    async def send_heartbeats(self, entries):
+        # Heartbeats only refresh timestamps, so resending them is harmless
+        return await self.request("POST", "/node/heartbeats", json={"heartbeats": entries}, idempotent=True)
+
+    async def reserve(self, cpu_cores, ttl=5):
+        return await self.request("POST", "/reservation", json={"cpu_cores": cpu_cores, "ttl": ttl})
+
+    async def release_reservation(self, reservation_id):
+        return await self.request("DELETE", f"/reservation/{reservation_id}")
+
+    async def rebalance(self, max_migrations=None):
+        body = {"max_migrations": max_migrations} if max_migrations is not None else {}
+        return await self.request("POST", "/cluster/rebalance", json=body)
+
+    # --- Bulk helpers ---
+
+    async def gather(self, coroutines):
+        """Run coroutines concurrently; failures are returned as exception objects"""
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+
+    async def add_nodes(self, count, cpu_cores):
+        return await self.gather(self.add_node(cpu_cores) for _ in range(count))
+
+    async def submit_pods(self, count, cpu_cores, priority=0):
+        return await self.gather(self.request_pod(cpu_cores, priority) for _ in range(count))
+
+    async def remove_pods(self, pod_ids):
+        return await self.gather(self.remove_pod(pod_id) for pod_id in pod_ids)
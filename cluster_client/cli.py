@@ -0,0 +1,163 @@
+"""
+Headless command line for scripting and CI.
+
+    python -m cluster_client status
+    python -m cluster_client add-nodes 10 --cpu 4
+    python -m cluster_client --concurrency 64 submit-pods 500 --cpu 0.5 --priority 1
+    python -m cluster_client --concurrency 64 bench --requests 5000
+
+Every command prints JSON on stdout and exits non-zero on failure.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from .async_client import AsyncClusterClient, aiohttp
+from .errors import ApiError
+from .sync_client import ClusterClient
+
+
+def summarize(results):
+    """Split bulk results into successes and error messages"""
+    errors = [str(result) for result in results if isinstance(result, Exception)]
+    return {
+        "succeeded": len(results) - len(errors),
+        "failed": len(errors),
+        "results": [result for result in results if not isinstance(result, Exception)],
+        "errors": errors[:20]
+    }
+
+
+def run_bulk(args, method, *method_args):
+    """Run a bulk helper, on the asyncio client when aiohttp is available"""
+    if aiohttp is None:
+        with ClusterClient(args.url, max_concurrency=args.concurrency, retries=args.retries) as client:
+            return getattr(client, method)(*method_args)
+
+    async def run():
+        async with AsyncClusterClient(args.url, max_concurrency=args.concurrency, retries=args.retries) as client:
+            return await getattr(client, method)(*method_args)
+
+    return asyncio.run(run())
+
+
+async def bench(args):
+    """Fire `requests` GETs at `endpoint` with bounded concurrency and report throughput"""
+    latencies = []
+    errors = 0
+
+    async with AsyncClusterClient(args.url, max_concurrency=args.concurrency, retries=0) as client:
+        remaining = args.requests
+
+        async def worker():
+            # Each worker keeps one request in flight, so latency excludes queueing
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    await client.request("GET", args.endpoint)
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else None
+
+    return {
+        "endpoint": args.endpoint,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "requests_per_second": args.requests / elapsed if elapsed else None,
+        "latency_ms": {"p50": percentile(0.5), "p99": percentile(0.99)}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cluster_client", description="Headless cluster control")
+    parser.add_argument("--url", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--concurrency", type=int, default=32, help="Max requests in flight")
+    parser.add_argument("--retries", type=int, default=3, help="Retries for transient failures")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="Cluster status")
+    subparsers.add_parser("nodes", help="List nodes")
+    subparsers.add_parser("pods", help="List pods")
+
+    add_nodes = subparsers.add_parser("add-nodes", help="Add N nodes")
+    add_nodes.add_argument("count", type=int)
+    add_nodes.add_argument("--cpu", type=float, required=True)
+
+    submit_pods = subparsers.add_parser("submit-pods", help="Submit N pods")
+    submit_pods.add_argument("count", type=int)
+    submit_pods.add_argument("--cpu", type=float, required=True)
+    submit_pods.add_argument("--priority", type=int, default=0)
+
+    remove_pod = subparsers.add_parser("remove-pod", help="Remove a pod")
+    remove_pod.add_argument("pod_id")
+    remove_pod.add_argument("--if-version", type=int, help="Only if the pod is at this resource version")
+
+    fail_node = subparsers.add_parser("fail-node", help="Simulate a node failure")
+    fail_node.add_argument("node_id")
+    fail_node.add_argument("--if-version", type=int, help="Only if the node is at this resource version")
+
+    rebalance = subparsers.add_parser("rebalance", help="Run one rebalancing cycle")
+    rebalance.add_argument("--max-migrations", type=int)
+
+    bench_parser = subparsers.add_parser("bench", help="Measure request throughput")
+    bench_parser.add_argument("--requests", type=int, default=2000)
+    bench_parser.add_argument("--endpoint", default="/cluster/status")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command in ("add-nodes", "submit-pods"):
+            if args.command == "add-nodes":
+                output = summarize(run_bulk(args, "add_nodes", args.count, args.cpu))
+            else:
+                output = summarize(run_bulk(args, "submit_pods", args.count, args.cpu, args.priority))
+            exit_code = 0 if output["failed"] == 0 else 1
+        elif args.command == "bench":
+            if aiohttp is None:
+                parser.error("bench requires aiohttp")
+            output = asyncio.run(bench(args))
+            exit_code = 0 if output["errors"] == 0 else 1
+        else:
+            with ClusterClient(args.url, retries=args.retries) as client:
+                if args.command == "status":
+                    output = client.cluster_status()
+                elif args.command == "nodes":
+                    output = client.nodes()
+                elif args.command == "pods":
+                    output = client.pods()
+                elif args.command == "remove-pod":
+                    output = client.remove_pod(args.pod_id, args.if_version)
+                elif args.command == "fail-node":
+                    output = client.fail_node(args.node_id, args.if_version)
+                else:
+                    output = client.rebalance(args.max_migrations)
+            exit_code = 0
+    except ApiError as e:
+        output = {"error": e.message, "status": e.status, **e.payload}
+        exit_code = 1
+    except Exception as e:
+        output = {"error": str(e)}
+        exit_code = 2
+
+    json.dump(output, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
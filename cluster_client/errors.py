@@ -0,0 +1,47 @@
+import random
+
+# Responses worth retrying: the server or a proxy in front of it is briefly unavailable
+RETRY_STATUSES = (502, 503, 504)
+# Methods that are safe to send twice
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+
+class ApiError(Exception):
+    """Error response from the API server"""
+
+    def __init__(self, status, message, payload=None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.message = message
+        self.payload = payload or {}
+
+
+class ConflictError(ApiError):
+    """409: a resource version or reservation no longer matches"""
+
+
+def raise_for_payload(status, payload):
+    """Raise ApiError for a non-2xx response"""
+    if 200 <= status < 300:
+        return
+    message = payload.get("error", "Request failed") if isinstance(payload, dict) else str(payload)
+    error_class = ConflictError if status == 409 else ApiError
+    raise error_class(status, message, payload if isinstance(payload, dict) else None)
+
+
+def is_idempotent(method, headers=None):
+    """
+    Whether a request can be resent after it may have reached the server.
+    A conditional DELETE can't remove anything twice. Other mutations may
+    only be retried when the connection was never made.
+    """
+    method = method.upper()
+    if method in IDEMPOTENT_METHODS:
+        return True
+    return method == "DELETE" and "If-Match" in (headers or {})
+
+
+def backoff_delays(retries, backoff):
+    """Exponential backoff with full jitter: up to backoff, 2*backoff, 4*backoff, ..."""
+    for attempt in range(retries):
+        yield random.uniform(0, backoff * (2 ** attempt))
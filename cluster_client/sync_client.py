@@ -0,0 +1,167 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from .errors import RETRY_STATUSES, backoff_delays, is_idempotent, raise_for_payload
+
+
+def connect_failed(error):
+    """True if a ConnectionError happened before the request was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # Refused and unreachable connections surface as NewConnectionError,
+    # a ConnectTimeoutError subclass, wrapped in MaxRetryError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class ClusterClient:
+    """
+    Blocking client for the cluster API server.
+
+    One pooled keep-alive session is shared by all calls. Idempotent requests
+    are retried with exponential backoff on connection errors and 502/503/504
+    responses; other requests only when the connection could not be made, so
+    a retry never creates a duplicate node or pod. Other errors raise
+    ApiError (ConflictError for 409). Bulk helpers run requests on a thread
+    pool capped at `max_concurrency`.
+    """
+
+    def __init__(self, base_url="http://localhost:8000", max_concurrency=16, retries=3,
+                 backoff=0.1, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, method, endpoint, json=None, headers=None, idempotent=None):
+        """
+        Send a request, retrying transient failures, and return the decoded JSON.
+        `idempotent` overrides the method-based default from is_idempotent().
+        """
+        if idempotent is None:
+            idempotent = is_idempotent(method, headers)
+        delays = backoff_delays(self.retries, self.backoff)
+        while True:
+            try:
+                response = self.session.request(method, f"{self.base_url}{endpoint}", json=json,
+                                                headers=headers, timeout=self.timeout)
+            except requests.exceptions.ConnectionError as e:
+                delay = next(delays, None) if idempotent or connect_failed(e) else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            if idempotent and response.status_code in RETRY_STATUSES:
+                delay = next(delays, None)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
+
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = {"error": response.text}
+            raise_for_payload(response.status_code, payload)
+            return payload
+
+    # --- Reads ---
+
+    def health(self):
+        """True if the server answers; False if it is down or unreachable"""
+        try:
+            response = self.session.get(f"{self.base_url}/", timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 200
+
+    def nodes(self):
+        return self.request("GET", "/nodes")["nodes"]
+
+    def pods(self):
+        return self.request("GET", "/pods")["pods"]
+
+    def node(self, node_id):
+        return self.request("GET", f"/node/{node_id}")
+
+    def pod(self, pod_id):
+        return self.request("GET", f"/pod/{pod_id}")
+
+    def cluster_status(self):
+        return self.request("GET", "/cluster/status")
+
+    # --- Mutations ---
+
+    def add_node(self, cpu_cores):
+        return self.request("POST", "/node/add", json={"cpu_cores": cpu_cores})
+
+    def fail_node(self, node_id, resource_version=None):
+        headers = {"If-Match": str(resource_version)} if resource_version is not None else None
+        return self.request("POST", f"/node/fail/{node_id}", headers=headers)
+
+    def request_pod(self, cpu_cores, priority=0, reservation_id=None):
+        body = {"cpu_cores": cpu_cores, "priority": priority}
+        if reservation_id is not None:
+            body["reservation_id"] = reservation_id
+        return self.request("POST", "/pod/request", json=body)
+
+    def remove_pod(self, pod_id, resource_version=None):
+        headers = {"If-Match": str(resource_version)} if resource_version is not None else None
+        return self.request("DELETE", f"/pod/remove/{pod_id}", headers=headers)
+
+    def send_heartbeats(self, entries):
+        # Heartbeats only refresh timestamps, so resending them is harmless
+        return self.request("POST", "/node/heartbeats", json={"heartbeats": entries}, idempotent=True)
+
+    def reserve(self, cpu_cores, ttl=5):
+        return self.request("POST", "/reservation", json={"cpu_cores": cpu_cores, "ttl": ttl})
+
+    def release_reservation(self, reservation_id):
+        return self.request("DELETE", f"/reservation/{reservation_id}")
+
+    def rebalance(self, max_migrations=None):
+        body = {"max_migrations": max_migrations} if max_migrations is not None else {}
+        return self.request("POST", "/cluster/rebalance", json=body)
+
+    # --- Bulk helpers ---
+
+    def map(self, func, items):
+        """
+        Apply `func` to each item with at most `max_concurrency` in flight.
+        Returns results in order; failures are returned as exception objects.
+        """
+        def call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(call, items))
+
+    def add_nodes(self, count, cpu_cores):
+        return self.map(lambda _: self.add_node(cpu_cores), range(count))
+
+    def submit_pods(self, count, cpu_cores, priority=0):
+        return self.map(lambda _: self.request_pod(cpu_cores, priority), range(count))
+
+    def remove_pods(self, pod_ids):
+        return self.map(self.remove_pod, pod_ids)
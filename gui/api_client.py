@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ApiClient:
+    """
+    Shared HTTP client for the GUI.
+
+    Uses one keep-alive session for all calls, a small pool for fetching
+    several endpoints at once, and a separate bounded pool for background
+    tasks (refreshes and actions). Refresh tasks submitted under the same key
+    while one is still running are coalesced. Tasks run on their own pool
+    so a task waiting on fetches can never starve the fetch workers.
+    """
+
+    def __init__(self, base_url, max_fetches=4, max_tasks=4):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_fetches + max_tasks)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.fetch_pool = ThreadPoolExecutor(max_workers=max_fetches, thread_name_prefix="api-fetch")
+        self.task_pool = ThreadPoolExecutor(max_workers=max_tasks, thread_name_prefix="api-task")
+        self._inflight = {}  # key -> Future of a running de-duplicated task
+        self._rerun = set()  # Keys requested again while their task was running
+        self._lock = threading.Lock()
+
+    def request(self, method, endpoint, **kwargs):
+        return self.session.request(method, f"{self.base_url}{endpoint}", **kwargs)
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.request("POST", endpoint, **kwargs)
+
+    def delete(self, endpoint, **kwargs):
+        return self.request("DELETE", endpoint, **kwargs)
+
+    def fetch_many(self, fetch, calls):
+        """
+        Call `fetch(*args)` for each argument tuple in `calls` concurrently and
+        return the results in the same order. Takes as long as the slowest call.
+        """
+        futures = [self.fetch_pool.submit(fetch, *args) for args in calls]
+        return [future.result() for future in futures]
+
+    def submit(self, func, *args, key=None):
+        """
+        Run `func` on the task pool. With a `key`, a call made while a task
+        with the same key is still running returns that task's future and
+        schedules exactly one re-run after it finishes, so a refresh asked for
+        after a mutation never reuses a response fetched before it.
+        """
+        if key is None:
+            return self.task_pool.submit(func, *args)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None and not future.done():
+                self._rerun.add(key)
+                return future
+            future = self.task_pool.submit(func, *args)
+            self._inflight[key] = future
+
+        def forget(done_future):
+            with self._lock:
+                if self._inflight.get(key) is done_future:
+                    del self._inflight[key]
+                rerun = key in self._rerun
+                self._rerun.discard(key)
+            if rerun:
+                self.submit(func, *args, key=key)
+
+        future.add_done_callback(forget)
+        return future
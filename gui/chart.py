@@ -0,0 +1,117 @@
+import time
+import tkinter as tk
+from collections import deque
+
+
+class TimeSeriesChart(tk.Canvas):
+    """
+    Scrolling line chart that redraws incrementally.
+
+    Each new sample adds one line segment per series and shifts the existing
+    ones left with a single canvas move; segments that scroll out of the
+    window are deleted. The whole chart is only repainted, from `history`,
+    when it is resized or a value outgrows the y-axis.
+    """
+
+    PADDING = 30
+
+    def __init__(self, parent, history, series, title, window_seconds=300, y_max=None, **kwargs):
+        super().__init__(parent, bg="white", highlightthickness=0, **kwargs)
+        self.history = history
+        self.series = series  # [(name, color, label), ...]
+        self.title = title
+        self.window_seconds = window_seconds
+        self.fixed_y_max = y_max
+        self.y_max = y_max or 10
+        self.last_points = {}  # name -> (timestamp, value) of the newest drawn sample
+        self.segments = deque()  # (timestamp, [canvas item IDs]) oldest first
+        self.last_time = None
+        self.bind("<Configure>", lambda e: self.redraw())
+
+    def _plot_area(self):
+        width = max(self.winfo_width(), 2 * self.PADDING + 1)
+        height = max(self.winfo_height(), 2 * self.PADDING + 1)
+        return self.PADDING, 10, width - 10, height - self.PADDING
+
+    def _x(self, timestamp, now):
+        left, _, right, _ = self._plot_area()
+        return right - (now - timestamp) * (right - left) / self.window_seconds
+
+    def _y(self, value):
+        _, top, _, bottom = self._plot_area()
+        return bottom - min(value, self.y_max) * (bottom - top) / self.y_max
+
+    def _draw_axes(self):
+        left, top, right, bottom = self._plot_area()
+        self.delete("axes")
+        self.create_line(left, bottom, right, bottom, tags="axes")
+        self.create_line(left, top, left, bottom, tags="axes")
+        self.create_text(left - 4, top, text=f"{self.y_max:g}", anchor="ne", font=("Helvetica", 8), tags="axes")
+        self.create_text(left - 4, bottom, text="0", anchor="e", font=("Helvetica", 8), tags="axes")
+        self.create_text(right, bottom + 4, text="now", anchor="ne", font=("Helvetica", 8), tags="axes")
+        self.create_text(left, bottom + 4, text=f"-{self.window_seconds // 60}m", anchor="nw",
+                         font=("Helvetica", 8), tags="axes")
+
+        legend = "   ".join(label for _, _, label in self.series)
+        self.create_text(left + 5, top, text=f"{self.title}   {legend}", anchor="nw",
+                         font=("Helvetica", 9, "bold"), tags="axes")
+
+    def redraw(self):
+        """Repaint the whole chart from history"""
+        now = self.last_time or time.time()
+        self.delete("series")
+        self.segments.clear()
+        self.last_points.clear()
+
+        windows = {name: self.history.window(name, self.window_seconds, now) for name, _, _ in self.series}
+        if not self.fixed_y_max:
+            peak = max((value for samples in windows.values() for _, value in samples), default=0)
+            self.y_max = self._nice_max(peak)
+        self._draw_axes()
+
+        for name, color, _ in self.series:
+            samples = windows[name]
+            for (t0, v0), (t1, v1) in zip(samples, samples[1:]):
+                item = self.create_line(self._x(t0, now), self._y(v0), self._x(t1, now), self._y(v1),
+                                        fill=color, width=2, tags="series")
+                self.segments.append((t1, [item]))
+            if samples:
+                self.last_points[name] = samples[-1]
+        # Segments from different series were appended per series; keep them time ordered
+        self.segments = deque(sorted(self.segments, key=lambda segment: segment[0]))
+
+    def add_sample(self, timestamp, values):
+        """Draw the newest sample, shifting the chart instead of repainting it"""
+        if not self.fixed_y_max and max(values.get(name, 0) for name, _, _ in self.series) > self.y_max:
+            self.last_time = timestamp
+            self.redraw()
+            return
+
+        if self.last_time is not None:
+            left, _, right, _ = self._plot_area()
+            self.move("series", -(timestamp - self.last_time) * (right - left) / self.window_seconds, 0)
+        self.last_time = timestamp
+
+        items = []
+        for name, color, _ in self.series:
+            previous = self.last_points.get(name)
+            value = values.get(name, 0)
+            if previous is not None:
+                items.append(self.create_line(self._x(previous[0], timestamp), self._y(previous[1]),
+                                              self._x(timestamp, timestamp), self._y(value),
+                                              fill=color, width=2, tags="series"))
+            self.last_points[name] = (timestamp, value)
+        if items:
+            self.segments.append((timestamp, items))
+
+        # Drop segments that have scrolled out of the window
+        while self.segments and self.segments[0][0] < timestamp - self.window_seconds:
+            self.delete(*self.segments.popleft()[1])
+
+    @staticmethod
+    def _nice_max(peak):
+        """Round the y-axis up so it doesn't rescale on every new peak"""
+        nice = 10
+        while nice < peak * 1.2:
+            nice *= 2
+        return nice
@@ -5,16 +5,39 @@ import time
 import threading
 import json
 from queue import Queue
+from virtual_table import VirtualTable
+from api_client import ApiClient
+from timeseries import ClusterHistory
+from chart import TimeSeriesChart
 
 class KubernetesSimulationGUI:
+    # Adaptive polling bounds (seconds): poll fast after mutations, back off when idle
+    POLL_MIN_INTERVAL = 2
+    POLL_MAX_INTERVAL = 30
+    POLL_BACKOFF = 1.5
+
+    # Snapshot updates where only the newest queued one needs rendering
+    COALESCED_UPDATES = ("server_status", "nodes", "pods", "cluster")
+
     def __init__(self, root):
         self.root = root
         self.root.title("Kubernetes Simulation System")
         self.root.geometry("800x700")
         self.api_url = "http://localhost:8000"
         
+        # Shared keep-alive session and bounded worker pools for all API calls
+        self.client = ApiClient(self.api_url)
+        
         # Queue for communication between threads
         self.update_queue = Queue()
+        
+        # Adaptive polling state; the event wakes the poller early after mutations
+        self.poll_interval = self.POLL_MIN_INTERVAL
+        self.poll_wakeup = threading.Event()
+        self._last_snapshot = None
+        
+        # Bounded, downsampled history of cluster metrics for the charts
+        self.history = ClusterHistory()
 
         # Status variables
         self.status_var = StringVar()
@@ -77,6 +100,20 @@ class KubernetesSimulationGUI:
         # Make the window resizable
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(2, weight=1)
+        
+        # Debug overlay with per-frame render times, toggled with F12
+        self.debug_var = StringVar()
+        self.debug_label = tk.Label(self.root, textvariable=self.debug_var, font=("Courier", 9),
+                                    bg="black", fg="#00FF00", anchor="w", justify=tk.LEFT)
+        self.debug_visible = False
+        self.root.bind("<F12>", self.toggle_debug_overlay)
+    
+    def toggle_debug_overlay(self, event=None):
+        self.debug_visible = not self.debug_visible
+        if self.debug_visible:
+            self.debug_label.place(relx=1.0, rely=1.0, anchor="se", x=-5, y=-5)
+        else:
+            self.debug_label.place_forget()
     
     def setup_nodes_tab(self):
         # Button frame
@@ -87,9 +124,19 @@ class KubernetesSimulationGUI:
         fetch_nodes_button = tk.Button(button_frame, text="Refresh Nodes", command=lambda: self.trigger_refresh('nodes'), width=15, bg="#4CAF50", fg="white")
         fetch_nodes_button.pack(side=tk.LEFT, padx=5)
         
-        # Text area for node information
-        self.nodes_text_area = scrolledtext.ScrolledText(self.nodes_tab, wrap=tk.WORD, width=90, height=20)
-        self.nodes_text_area.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        # Table of nodes; only visible rows are materialized
+        self.nodes_table = VirtualTable(self.nodes_tab, [
+            ("node_id", "Node ID", 260),
+            ("status", "Status", 70),
+            ("cpu", "CPU Cores", 70),
+            ("usage", "Used / Available", 120),
+            ("pods", "Pods", 50),
+            ("heartbeat", "Last Heartbeat", 110),
+        ], height=15, on_select=lambda node_id: self._set_entry(self.node_id_entry, node_id))
+        self.nodes_table.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.nodes_table.tag_configure("active", foreground="green")
+        self.nodes_table.tag_configure("failed", foreground="red")
+        self.nodes_table.tag_configure("stale", foreground="orange")
         
         # Node creation frame
         node_create_frame = tk.LabelFrame(self.nodes_tab, text="Add New Node", padx=10, pady=10)
@@ -134,9 +181,18 @@ class KubernetesSimulationGUI:
         fetch_pods_button = tk.Button(button_frame, text="Refresh Pods", command=lambda: self.trigger_refresh('pods'), width=15, bg="#4CAF50", fg="white")
         fetch_pods_button.pack(side=tk.LEFT, padx=5)
         
-        # Text area for pod information
-        self.pods_text_area = scrolledtext.ScrolledText(self.pods_tab, wrap=tk.WORD, width=90, height=20)
-        self.pods_text_area.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        # Table of pods; only visible rows are materialized
+        self.pods_table = VirtualTable(self.pods_tab, [
+            ("pod_id", "Pod ID", 260),
+            ("node", "Assigned Node", 150),
+            ("cpu", "CPU", 50),
+            ("priority", "Priority", 60),
+            ("status", "Status", 80),
+            ("created", "Created", 140),
+        ], height=15, on_select=lambda pod_id: self._set_entry(self.pod_id_entry, pod_id))
+        self.pods_table.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.pods_table.tag_configure("running", foreground="green")
+        self.pods_table.tag_configure("pending", foreground="orange")
         
         # Pod creation frame
         pod_create_frame = tk.LabelFrame(self.pods_tab, text="Request New Pod", padx=10, pady=10)
@@ -173,8 +229,23 @@ class KubernetesSimulationGUI:
         self.pods_tab.rowconfigure(1, weight=1)
     
     def setup_cluster_tab(self):
+        # Charts of recent utilization, nodes and pods
+        charts_frame = tk.Frame(self.cluster_tab)
+        charts_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.utilization_chart = TimeSeriesChart(charts_frame, self.history, [
+            ("utilization", "#2196F3", "CPU %"),
+        ], "Utilization", y_max=100, height=140)
+        self.utilization_chart.pack(fill=tk.X, pady=2)
+        self.workload_chart = TimeSeriesChart(charts_frame, self.history, [
+            ("active_nodes", "green", "Active nodes"),
+            ("failed_nodes", "red", "Failed nodes"),
+            ("running_pods", "#4CAF50", "Running pods"),
+            ("pending_pods", "orange", "Pending pods"),
+        ], "Nodes & Pods", height=140)
+        self.workload_chart.pack(fill=tk.X, pady=2)
+        
         # Cluster status text area
-        self.cluster_text_area = scrolledtext.ScrolledText(self.cluster_tab, wrap=tk.WORD, width=90, height=30)
+        self.cluster_text_area = scrolledtext.ScrolledText(self.cluster_tab, wrap=tk.WORD, width=90, height=12)
         self.cluster_text_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Refresh button (now triggers background refresh)
@@ -183,19 +254,18 @@ class KubernetesSimulationGUI:
     
     def process_updates(self):
         """Process updates from the background thread queue."""
+        frame_start = time.perf_counter()
+        latest = {}  # Last writer wins for snapshot updates
+        coalesced = 0
+        refresh_requested = False
+        render_times = {}
         try:
             while not self.update_queue.empty():
                 update_type, data = self.update_queue.get_nowait()
-                if update_type == "server_status":
-                    self._update_server_status(data)
-                elif update_type == "nodes":
-                    self._update_nodes_display(data)
-                elif update_type == "pods":
-                    self._update_pods_display(data)
-                elif update_type == "cluster":
-                    # Cluster update now expects pod data as well
-                    nodes_data, pods_data, cluster_data = data
-                    self._update_cluster_display(cluster_data, pods_data) # Pass pod data
+                if update_type in self.COALESCED_UPDATES:
+                    if update_type in latest:
+                        coalesced += 1
+                    latest[update_type] = data
                 elif update_type == "message":
                     level, title, message = data
                     if level == "info":
@@ -206,56 +276,89 @@ class KubernetesSimulationGUI:
                     entry_widget = data
                     entry_widget.delete(0, tk.END)
                 elif update_type == "refresh_all":
-                    # Triggered after successful actions
-                    self.trigger_refresh('all')
+                    # Triggered after successful actions; a burst needs only one refresh
+                    refresh_requested = True
+
+            if refresh_requested:
+                # Wakes the poller, which refreshes everything right away
+                self.note_mutation()
+
+            # Render only the newest snapshot of each type
+            for update_type in self.COALESCED_UPDATES:
+                if update_type not in latest:
+                    continue
+                render_start = time.perf_counter()
+                data = latest[update_type]
+                if update_type == "server_status":
+                    self._update_server_status(data)
+                elif update_type == "nodes":
+                    self._update_nodes_display(data)
+                elif update_type == "pods":
+                    self._update_pods_display(data)
+                elif update_type == "cluster":
+                    # Cluster update now expects pod data as well
+                    nodes_data, pods_data, cluster_data = data
+                    self._update_cluster_display(cluster_data, pods_data) # Pass pod data
+                render_times[update_type] = (time.perf_counter() - render_start) * 1000
 
         except Exception as e:
             print(f"Error processing update queue: {e}")
         finally:
+            if render_times:
+                self._update_debug_overlay(frame_start, render_times, coalesced)
             # Schedule the next check
             self.root.after(100, self.process_updates)
 
-    def background_api_worker(self):
-        """Handles background API calls and periodic refreshes."""
-        last_refresh_time = 0
-        refresh_interval = 10 # seconds
-
-        while True:
-            current_time = time.time()
+    def _update_debug_overlay(self, frame_start, render_times, coalesced):
+        """Show the last frame's render times in the debug overlay."""
+        frame_ms = (time.perf_counter() - frame_start) * 1000
+        parts = " ".join(f"{name}={ms:.1f}" for name, ms in render_times.items())
+        self.debug_var.set(f"frame {frame_ms:.1f} ms | {parts}\n"
+                           f"coalesced {coalesced} | poll every {self.poll_interval:.1f}s")
 
-            # --- Periodic Refresh ---
-            if current_time - last_refresh_time >= refresh_interval:
-                self._background_check_server_status()
-                self._background_fetch_all_data()
-                last_refresh_time = current_time
+    def note_mutation(self):
+        """Poll fast again after a mutation, starting right away."""
+        self.poll_interval = self.POLL_MIN_INTERVAL
+        self.poll_wakeup.set()
 
-            # --- Check for Manual Refresh Triggers (Optional, handled by direct calls now) ---
-            # Can add logic here if needed for more complex background tasks
+    def background_api_worker(self):
+        """Handles background API calls and adaptive periodic refreshes."""
+        while True:
+            self._background_check_server_status()
+            # Wait for it so a slow server doesn't pile up periodic refreshes
+            try:
+                changed = self.trigger_refresh('all').result()
+            except Exception as e:
+                print(f"Error during periodic refresh: {e}")
+                changed = False
+
+            # Back off while the cluster is idle, poll fast while it changes
+            if changed:
+                self.poll_interval = self.POLL_MIN_INTERVAL
+            else:
+                self.poll_interval = min(self.poll_interval * self.POLL_BACKOFF, self.POLL_MAX_INTERVAL)
 
-            time.sleep(1) # Check queue/time periodically
+            self.poll_wakeup.wait(self.poll_interval)
+            self.poll_wakeup.clear()
 
     def trigger_refresh(self, refresh_type='all'):
-        """Triggers a data refresh in the background thread."""
-        # This function can be called directly by buttons
-        # The background worker will pick up the refresh task implicitly
-        # or we can explicitly signal it if needed (using another queue, etc.)
-        # For simplicity, we'll just let the periodic refresh handle it,
-        # but for immediate feedback, we call the background fetch directly.
-        if refresh_type == 'all':
-            threading.Thread(target=self._background_fetch_all_data, daemon=True).start()
-        elif refresh_type == 'nodes':
-             threading.Thread(target=self._background_fetch_nodes, daemon=True).start()
-        elif refresh_type == 'pods':
-             threading.Thread(target=self._background_fetch_pods, daemon=True).start()
-        elif refresh_type == 'cluster':
-             threading.Thread(target=self._background_fetch_cluster_status, daemon=True).start()
+        """Triggers a data refresh in the background, unless one of the same type is in flight."""
+        # Buttons, the periodic worker and post-action refreshes all go through
+        # here, so repeated clicks share one request instead of spawning threads
+        refresh_funcs = {
+            'all': self._background_fetch_all_data,
+            'nodes': self._background_fetch_nodes,
+            'pods': self._background_fetch_pods,
+            'cluster': self._background_fetch_cluster_status,
+        }
+        return self.client.submit(refresh_funcs[refresh_type], key=('refresh', refresh_type))
 
 
     def _background_check_server_status(self):
         """Check server status in the background."""
         status_data = {"status": "Not Connected", "color": "red"}
         try:
-            response = requests.get(f"{self.api_url}/", timeout=3)
+            response = self.client.get("/", timeout=3)
             if response.status_code == 200:
                 status_data = {"status": "Connected", "color": "green"}
             else:
@@ -274,44 +377,49 @@ class KubernetesSimulationGUI:
 
 
     def _background_fetch_all_data(self):
-        """Fetch all data types in the background."""
-        nodes_data = self._fetch_data("/nodes", "nodes")
-        pods_data = self._fetch_data("/pods", "pods")
-        cluster_data = self._fetch_data("/cluster/status", "cluster")
+        """Fetch all data types in the background, concurrently."""
+        nodes_data, pods_data, cluster_data = self.client.fetch_many(self._fetch_data, [
+            ("/nodes", "nodes"), ("/pods", "pods"), ("/cluster/status", "cluster")])
 
+        # Table rows are built here so the main thread only diffs and renders
         if nodes_data is not None:
-            self.update_queue.put(("nodes", nodes_data))
+            self.update_queue.put(("nodes", self._build_node_rows(nodes_data)))
         if pods_data is not None:
-            self.update_queue.put(("pods", pods_data))
+            self.update_queue.put(("pods", self._build_pod_rows(pods_data)))
         if cluster_data is not None and pods_data is not None and nodes_data is not None:
              # Pass all data needed for cluster display including pod counts
             self.update_queue.put(("cluster", (nodes_data, pods_data, cluster_data)))
 
+        # Pods and cluster totals don't carry timestamps that tick on their own,
+        # so comparing them tells the poller whether the cluster is changing
+        snapshot = (pods_data, cluster_data)
+        changed = snapshot != self._last_snapshot
+        self._last_snapshot = snapshot
+        return changed
+
 
     def _background_fetch_nodes(self):
         nodes_data = self._fetch_data("/nodes", "nodes")
         if nodes_data is not None:
-            self.update_queue.put(("nodes", nodes_data))
+            self.update_queue.put(("nodes", self._build_node_rows(nodes_data)))
 
     def _background_fetch_pods(self):
         pods_data = self._fetch_data("/pods", "pods")
         if pods_data is not None:
-            self.update_queue.put(("pods", pods_data))
+            self.update_queue.put(("pods", self._build_pod_rows(pods_data)))
 
     def _background_fetch_cluster_status(self):
-         # Cluster status needs pod data too for counts
-        nodes_data = self._fetch_data("/nodes", "nodes") # Fetch nodes for consistency if needed
-        pods_data = self._fetch_data("/pods", "pods")
-        cluster_data = self._fetch_data("/cluster/status", "cluster")
-        if cluster_data is not None and pods_data is not None and nodes_data is not None:
-            self.update_queue.put(("cluster", (nodes_data, pods_data, cluster_data)))
+        # Cluster status needs pod data too for counts; nodes aren't used
+        pods_data, cluster_data = self.client.fetch_many(self._fetch_data, [
+            ("/pods", "pods"), ("/cluster/status", "cluster")])
+        if cluster_data is not None and pods_data is not None:
+            self.update_queue.put(("cluster", (None, pods_data, cluster_data)))
 
 
     def _fetch_data(self, endpoint, data_key):
         """Helper function to fetch data from an API endpoint."""
-        url = f"{self.api_url}{endpoint}"
         try:
-            response = requests.get(url, timeout=5)
+            response = self.client.get(endpoint, timeout=5)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -325,105 +433,77 @@ class KubernetesSimulationGUI:
             return None
 
 
-    def _update_nodes_display(self, data):
-        """Update the nodes text area (runs in main thread)."""
-        self.nodes_text_area.config(state=tk.NORMAL)
-        self.nodes_text_area.delete(1.0, tk.END)
-        if not data or 'nodes' not in data or not data['nodes']:
-            self.nodes_text_area.insert(tk.END, "No nodes found or error fetching nodes.")
-            self.nodes_text_area.config(state=tk.DISABLED)
-            return
+    def _set_entry(self, entry_widget, value):
+        """Fill an ID entry from a selected table row."""
+        entry_widget.delete(0, tk.END)
+        entry_widget.insert(0, value)
 
-        self.nodes_text_area.insert(tk.END, "NODES STATUS:\n\n")
-        nodes_map = data['nodes']
+    def _build_node_rows(self, data):
+        """Build the nodes table rows from /nodes data (runs in a background worker)."""
+        nodes_map = (data or {}).get('nodes') or {}
+        rows = {}
 
         for node_id, node_info in nodes_map.items():
-            # ... (rest of the node formatting logic remains the same) ...
-            if node_info['status'] == 'active':
-                self.nodes_text_area.insert(tk.END, f"Node ID: {node_id} ", "node_id")
-                self.nodes_text_area.insert(tk.END, "(ACTIVE)\n", "active")
-            else:
-                self.nodes_text_area.insert(tk.END, f"Node ID: {node_id} ", "node_id")
-                self.nodes_text_area.insert(tk.END, "(FAILED)\n", "failed")
-
-            self.nodes_text_area.insert(tk.END, f"Container ID: {node_info.get('container_id', 'N/A')[:12]}\n")
-            self.nodes_text_area.insert(tk.END, f"CPU Cores: {node_info.get('cpu_cores', 'N/A')}\n")
-
-            if "heartbeat_age" in node_info:
-                heartbeat_age = node_info["heartbeat_age"]
-                status_color = "green" if heartbeat_age < 10 else "orange" if heartbeat_age < 15 else "red"
-                self.nodes_text_area.insert(tk.END, f"Last Heartbeat: {heartbeat_age:.1f} seconds ago\n", status_color)
-
-            used_cpu = sum(float(pod.get('cpu_cores', 0)) for pod in node_info.get('pods', []))
+            node_pods = node_info.get('pods', [])
+            used_cpu = sum(float(pod.get('cpu_cores', 0)) for pod in node_pods)
             total_cpu = float(node_info.get('cpu_cores', 0))
             available_cpu = total_cpu - used_cpu
-            self.nodes_text_area.insert(tk.END, f"Resource Usage: {used_cpu:.2f}/{total_cpu} CPU cores (Available: {available_cpu:.2f})\n")
 
-            pod_count = len(node_info.get('pods', []))
-            if pod_count > 0:
-                self.nodes_text_area.insert(tk.END, f"Running Pods ({pod_count}):\n")
-                for pod in node_info.get('pods', []):
-                    self.nodes_text_area.insert(tk.END, f"  - Pod ID: {pod.get('pod_id', 'N/A')[:8]}... (CPU: {pod.get('cpu_cores', 'N/A')})\n")
-            else:
-                self.nodes_text_area.insert(tk.END, "Running Pods: None\n")
-
-            self.nodes_text_area.insert(tk.END, "-" * 60 + "\n\n")
+            heartbeat = ""
+            tag = "active" if node_info.get('status') == 'active' else "failed"
+            if "heartbeat_age" in node_info:
+                heartbeat_age = node_info["heartbeat_age"]
+                heartbeat = f"{heartbeat_age:.0f}s ago"
+                if tag == "active" and heartbeat_age >= 10:
+                    tag = "stale"
 
-        # Configure text tags for colors
-        self.nodes_text_area.tag_configure("active", foreground="green", font=("Helvetica", 10, "bold"))
-        self.nodes_text_area.tag_configure("failed", foreground="red", font=("Helvetica", 10, "bold"))
-        self.nodes_text_area.tag_configure("node_id", font=("Helvetica", 10, "bold"))
-        self.nodes_text_area.tag_configure("green", foreground="green")
-        self.nodes_text_area.tag_configure("orange", foreground="orange")
-        self.nodes_text_area.tag_configure("red", foreground="red")
-        self.nodes_text_area.config(state=tk.DISABLED)
+            rows[node_id] = ((
+                node_id,
+                node_info.get('status', 'unknown').upper(),
+                total_cpu,
+                f"{used_cpu:.2f} / {available_cpu:.2f}",
+                len(node_pods),
+                heartbeat
+            ), tag)
 
+        return rows
 
-    def _update_pods_display(self, data):
-        """Update the pods text area (runs in main thread)."""
-        self.pods_text_area.config(state=tk.NORMAL)
-        self.pods_text_area.delete(1.0, tk.END)
+    def _update_nodes_display(self, rows):
+        """Apply node changes to the nodes table (runs in main thread)."""
+        self.nodes_table.update_rows(rows)
 
-        if not data or 'pods' not in data or not data['pods']:
-            self.pods_text_area.insert(tk.END, "No pods found or error fetching pods.")
-            self.pods_text_area.config(state=tk.DISABLED)
-            return
 
-        self.pods_text_area.insert(tk.END, "PODS STATUS:\n\n")
-        pods_map = data['pods']
+    def _build_pod_rows(self, data):
+        """Build the pods table rows from /pods data (runs in a background worker)."""
+        pods_map = (data or {}).get('pods') or {}
+        rows = {}
 
         for pod_id, pod_info in pods_map.items():
-            # ... (rest of the pod formatting logic remains the same) ...
-            self.pods_text_area.insert(tk.END, f"Pod ID: {pod_id}\n", "pod_id")
-
             node_id = pod_info.get('node_id', None)
-            node_display = f"{node_id[:8]}..." if node_id else "None (pending assignment)"
-            self.pods_text_area.insert(tk.END, f"Assigned to Node: {node_display}\n")
-
-            cpu_cores = pod_info.get('cpu_cores', 'N/A')
-            self.pods_text_area.insert(tk.END, f"CPU Resources: {cpu_cores}\n")
-
-            status = pod_info.get('status', 'unknown').upper()
-            status_tag = "running" if status == 'RUNNING' else "pending" if status == 'PENDING' else "default_status"
-            self.pods_text_area.insert(tk.END, f"Status: {status}\n", status_tag)
+            node_display = f"{node_id[:8]}..." if node_id else "None (pending)"
 
+            created_time_str = ""
             if 'created_at' in pod_info:
-                created_time_str = "Invalid timestamp"
                 try:
-                    created_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(float(pod_info['created_at'])))
-                    created_time_str = created_time
+                    created_time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(float(pod_info['created_at'])))
                 except (ValueError, TypeError):
-                     pass # Keep default "Invalid timestamp"
-                self.pods_text_area.insert(tk.END, f"Created: {created_time_str}\n")
+                    created_time_str = "Invalid timestamp"
+
+            status = pod_info.get('status', 'unknown')
+            rows[pod_id] = ((
+                pod_id,
+                node_display,
+                pod_info.get('cpu_cores', 'N/A'),
+                pod_info.get('priority', 0),
+                status.upper(),
+                created_time_str
+            ), status if status in ("running", "pending") else "")
 
-            self.pods_text_area.insert(tk.END, "-" * 60 + "\n\n")
+        return rows
 
-        # Configure text tags for colors
-        self.pods_text_area.tag_configure("pod_id", font=("Helvetica", 10, "bold"))
-        self.pods_text_area.tag_configure("running", foreground="green", font=("Helvetica", 10, "bold"))
-        self.pods_text_area.tag_configure("pending", foreground="orange", font=("Helvetica", 10, "bold"))
-        self.pods_text_area.tag_configure("default_status", foreground="black") # Default color
-        self.pods_text_area.config(state=tk.DISABLED)
+    def _update_pods_display(self, rows):
+        """Apply pod changes to the pods table (runs in main thread)."""
+        self.pods_table.update_rows(rows)
 
 
     def _update_cluster_display(self, cluster_data, pods_data):
@@ -436,6 +516,12 @@ class KubernetesSimulationGUI:
             self.cluster_text_area.config(state=tk.DISABLED)
             return
 
+        # Record the sample and extend the charts with it
+        now = time.time()
+        sample = self.history.record(now, cluster_data, pods_data)
+        self.utilization_chart.add_sample(now, sample)
+        self.workload_chart.add_sample(now, sample)
+
         # Update the status bar label
         active_nodes = cluster_data.get('active_nodes', 0)
         total_pods = cluster_data.get('total_pods', 0)
@@ -464,12 +550,9 @@ class KubernetesSimulationGUI:
         self.cluster_text_area.insert(tk.END, "Workloads\n", "section")
         self.cluster_text_area.insert(tk.END, f"Total Pods: {cluster_data.get('total_pods', 0)}\n")
 
-        # Use the passed pods_data to count statuses
-        running_pods = 0
-        pending_pods = 0
-        if pods_data and 'pods' in pods_data:
-             running_pods = sum(1 for pod in pods_data['pods'].values() if pod.get('status') == 'running')
-             pending_pods = sum(1 for pod in pods_data['pods'].values() if pod.get('status') == 'pending')
+        # The history sample already counted pod statuses
+        running_pods = sample["running_pods"]
+        pending_pods = sample["pending_pods"]
 
         self.cluster_text_area.insert(tk.END, f"Running Pods: {running_pods}\n")
         self.cluster_text_area.insert(tk.END, f"Pending Pods: {pending_pods}\n\n")
@@ -485,8 +568,8 @@ class KubernetesSimulationGUI:
 
 
     def _run_action_in_background(self, action_func, *args):
-        """Runs a given action function in a background thread."""
-        threading.Thread(target=action_func, args=args, daemon=True).start()
+        """Runs a given action function on the bounded background task pool."""
+        self.client.submit(action_func, *args)
 
     # --- Action Methods (Trigger background execution) ---
 
@@ -535,7 +618,7 @@ class KubernetesSimulationGUI:
         """Add node API call (runs in background thread)."""
         try:
             data = {"cpu_cores": cpu_cores}
-            response = requests.post(f"{self.api_url}/node/add", json=data, timeout=10)
+            response = self.client.post("/node/add", json=data, timeout=10)
             response.raise_for_status()
             result = response.json()
             self.update_queue.put(("message", ("info", "Success", f"Node added successfully. Node ID: {result.get('node_id', 'Unknown')}")))
@@ -554,7 +637,7 @@ class KubernetesSimulationGUI:
     def _background_fail_node(self, node_id):
         """Fail node API call (runs in background thread)."""
         try:
-            response = requests.post(f"{self.api_url}/node/fail/{node_id}", timeout=10)
+            response = self.client.post(f"/node/fail/{node_id}", timeout=10)
             response.raise_for_status()
             result = response.json()
             self.update_queue.put(("message", ("info", "Success", result.get('message', 'Node failure simulated successfully'))))
@@ -574,7 +657,7 @@ class KubernetesSimulationGUI:
         """Deploy pod API call (runs in background thread)."""
         try:
             data = {"cpu_cores": cpu_cores}
-            response = requests.post(f"{self.api_url}/pod/request", json=data, timeout=10)
+            response = self.client.post("/pod/request", json=data, timeout=10)
 
             if response.status_code == 400 and "error" in response.json():
                  # Handle specific user errors like no suitable node
@@ -603,7 +686,7 @@ class KubernetesSimulationGUI:
     def _background_remove_pod(self, pod_id):
         """Remove pod API call (runs in background thread)."""
         try:
-            response = requests.delete(f"{self.api_url}/pod/remove/{pod_id}", timeout=10)
+            response = self.client.delete(f"/pod/remove/{pod_id}", timeout=10)
 
             if response.status_code == 404:
                 self.update_queue.put(("message", ("error", "Error", "Pod not found")))
@@ -0,0 +1,77 @@
+from collections import Counter, deque
+
+
+class DownsampledSeries:
+    """
+    Time series kept in fixed-size ring buffers at several resolutions.
+
+    Every sample goes into the raw tier; coarser tiers store the mean of each
+    fixed-width time bucket. Each tier is a bounded deque, so memory stays
+    constant however long the GUI runs, while older history stays available
+    at lower resolution.
+    """
+
+    # (bucket seconds, capacity): raw for ~10 min, 10 s for 2 h, 1 min for 24 h
+    DEFAULT_TIERS = ((0, 300), (10, 720), (60, 1440))
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = [(resolution, deque(maxlen=capacity)) for resolution, capacity in tiers]
+        self._buckets = {}  # resolution -> [bucket_start, total, count] being filled
+
+    def append(self, timestamp, value):
+        for resolution, samples in self.tiers:
+            if resolution == 0:
+                samples.append((timestamp, value))
+                continue
+
+            bucket_start = timestamp - timestamp % resolution
+            bucket = self._buckets.get(resolution)
+            if bucket is not None and bucket[0] != bucket_start:
+                # Bucket closed: store its mean at the bucket midpoint
+                samples.append((bucket[0] + resolution / 2, bucket[1] / bucket[2]))
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[resolution] = [bucket_start, 0.0, 0]
+            bucket[1] += value
+            bucket[2] += 1
+
+    def latest(self):
+        raw = self.tiers[0][1]
+        return raw[-1] if raw else None
+
+    def window(self, seconds, now):
+        """Samples from the last `seconds`, from the finest tier that covers them"""
+        start = now - seconds
+        for _, samples in self.tiers:
+            if samples and samples[0][0] <= start:
+                return [sample for sample in samples if sample[0] >= start]
+        # Nothing covers the whole window yet; use the tier reaching back furthest
+        tier = min((samples for _, samples in self.tiers if samples),
+                   key=lambda samples: samples[0][0], default=())
+        return [sample for sample in tier if sample[0] >= start]
+
+
+class ClusterHistory:
+    """Utilization, node counts and pod counts by status over time"""
+
+    SERIES = ("utilization", "active_nodes", "failed_nodes", "running_pods", "pending_pods")
+
+    def __init__(self, tiers=DownsampledSeries.DEFAULT_TIERS):
+        self.series = {name: DownsampledSeries(tiers) for name in self.SERIES}
+
+    def record(self, timestamp, cluster_data, pods_data):
+        """Add one sample from /cluster/status and /pods; returns the recorded values"""
+        pod_statuses = Counter(pod.get('status') for pod in (pods_data or {}).get('pods', {}).values())
+        values = {
+            "utilization": float(cluster_data.get('utilization_percentage', 0)),
+            "active_nodes": cluster_data.get('active_nodes', 0),
+            "failed_nodes": cluster_data.get('failed_nodes', 0),
+            "running_pods": pod_statuses['running'],
+            "pending_pods": pod_statuses['pending'],
+        }
+        for name, value in values.items():
+            self.series[name].append(timestamp, value)
+        return values
+
+    def window(self, name, seconds, now):
+        return self.series[name].window(seconds, now)
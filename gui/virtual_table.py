@@ -0,0 +1,150 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Table view that only materializes the rows currently visible.
+
+    The full data set lives in `rows` (key -> (values, tag)) and `order`; the
+    Treeview holds one item per visible line and those items are reused as
+    the view scrolls. Updates are diffed per key, so a refresh only touches
+    rows whose contents actually changed. The selection is tracked by row key
+    and re-applied to whichever slot shows that row.
+    """
+
+    def __init__(self, parent, columns, height=15, on_select=None):
+        super().__init__(parent)
+        self.columns = [column for column, _, _ in columns]
+        self.on_select = on_select
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", height=height, selectmode="browse")
+        for column, heading, width in columns:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.rows = {}      # key -> (values, tag)
+        self.order = []     # keys in display order
+        self.offset = 0     # index of the first visible row
+        self.visible_rows = height
+        self.slots = []     # Treeview item IDs, one per visible line
+        self.slot_state = []  # (key, values, tag) currently shown in each slot
+        self.selected = None  # Key of the selected row
+
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+
+    def tag_configure(self, tag, **options):
+        self.tree.tag_configure(tag, **options)
+
+    def update_rows(self, rows):
+        """
+        Replace the table contents with `rows`, an ordered {key: (values, tag)}
+        mapping. Returns the number of rows that were added, changed or removed.
+        """
+        changed = sum(1 for key, row in rows.items() if self.rows.get(key) != row)
+        changed += sum(1 for key in self.rows if key not in rows)
+
+        self.rows = rows
+        self.order = list(rows)
+        if self.selected not in rows:
+            self.selected = None
+        self._clamp_offset()
+        self._render()
+        return changed
+
+    def selected_key(self):
+        return self.selected
+
+    def _slot_key(self, item):
+        """Row key currently shown by a Treeview item"""
+        if item not in self.slots:
+            return None
+        state = self.slot_state[self.slots.index(item)]
+        return state[0] if state else None
+
+    def scroll(self, lines):
+        self.offset += lines
+        self._clamp_offset()
+        self._render()
+
+    def _clamp_offset(self):
+        self.offset = max(0, min(self.offset, len(self.order) - self.visible_rows))
+
+    def _render(self):
+        """Sync the materialized slots with the visible window of rows"""
+        visible_keys = self.order[self.offset:self.offset + self.visible_rows]
+
+        # Create or drop slots so there is exactly one per visible row
+        while len(self.slots) < len(visible_keys):
+            self.slots.append(self.tree.insert("", tk.END, values=()))
+            self.slot_state.append(None)
+        while len(self.slots) > len(visible_keys):
+            self.tree.delete(self.slots.pop())
+            self.slot_state.pop()
+
+        for index, key in enumerate(visible_keys):
+            values, tag = self.rows[key]
+            state = (key, values, tag)
+            if self.slot_state[index] != state:
+                self.tree.item(self.slots[index], values=values, tags=(tag,) if tag else ())
+                self.slot_state[index] = state
+
+        # Keep the highlight on the selected row, not on the slot it was in
+        selected_slot = None
+        if self.selected in visible_keys:
+            selected_slot = self.slots[visible_keys.index(self.selected)]
+        current = self.tree.selection()
+        if selected_slot is None:
+            if current:
+                self.tree.selection_remove(current)
+        elif current != (selected_slot,):
+            self.tree.selection_set(selected_slot)
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(visible_keys)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.offset = int(float(args[0]) * len(self.order))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.offset += amount * (self.visible_rows if unit == "pages" else 1)
+        self._clamp_offset()
+        self._render()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        style = ttk.Style()
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        visible_rows = max(1, (event.height - row_height) // row_height)  # Minus the heading row
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.tree.configure(height=visible_rows)
+            self._clamp_offset()
+            self._render()
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        key = self._slot_key(selection[0]) if selection else None
+        # Events from re-applying the selection in _render carry the same key
+        if key is None or key == self.selected:
+            return
+        self.selected = key
+        if self.on_select:
+            self.on_select(key)
@@ -0,0 +1,151 @@
+"""
+Lightweight heartbeat agent for node containers.
+
+Uses only the standard library so it runs in a bare python:3.8-slim image.
+
+    # In each node container, report straight to the API server
+    python agent.py agent --node-id <node_id> --api-url http://host:8000
+
+    # Or send to a sidecar aggregator that coalesces many nodes into one request
+    python agent.py aggregator --api-url http://host:8000 --port 9100
+    python agent.py agent --node-id <node_id> --aggregator host:9100
+
+The API server uses the aggregator path for the node containers it starts
+when NODE_AGENT_API_URL is set (see server.heartbeat_aggregator_address).
+"""
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+import urllib.request
+
+
+def sample_load():
+    """One-minute load average normalised by CPU count, or None if unavailable"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def post_heartbeats(api_url, entries, timeout=5):
+    """Send a batch of heartbeats to POST /node/heartbeats"""
+    body = json.dumps({"heartbeats": entries}).encode()
+    req = urllib.request.Request(f"{api_url}/node/heartbeats", data=body,
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class HeartbeatAggregator:
+    """
+    Coalesces heartbeats from many nodes and flushes them as one batch.
+    Only the latest load sample per node is kept between flushes.
+    """
+
+    def __init__(self, api_url, flush_interval=2.0):
+        self.api_url = api_url
+        self.flush_interval = flush_interval
+        self.pending = {}  # node_id -> latest load sample
+        self.lock = threading.Lock()
+
+    def record(self, node_id, load=None):
+        with self.lock:
+            self.pending[node_id] = load
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, {}
+        if not batch:
+            return None
+
+        entries = [{"node_id": node_id, "load": load} for node_id, load in batch.items()]
+        try:
+            return post_heartbeats(self.api_url, entries)
+        except OSError as e:
+            print(f"Error sending {len(entries)} heartbeats: {e}")
+            # Keep the batch for the next flush unless newer samples arrived
+            with self.lock:
+                for node_id, load in batch.items():
+                    self.pending.setdefault(node_id, load)
+            return None
+
+    def run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def serve_udp(self, host="0.0.0.0", port=9100):
+        """Accept 'node_id [load]' datagrams from agents"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        while True:
+            data, _ = sock.recvfrom(512)
+            parts = data.decode(errors="ignore").split()
+            if not parts:
+                continue
+            load = None
+            if len(parts) > 1:
+                try:
+                    load = float(parts[1])
+                except ValueError:
+                    pass
+            self.record(parts[0], load)
+
+
+def run_agent(node_id, api_url=None, aggregator=None, interval=5.0):
+    """Report this node's heartbeat every `interval` seconds"""
+    sock = None
+    if aggregator:
+        host, port = aggregator.rsplit(":", 1)
+        address = (host, int(port))
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    while True:
+        load = sample_load()
+        try:
+            if sock:
+                message = node_id if load is None else f"{node_id} {load:.3f}"
+                sock.sendto(message.encode(), address)
+            else:
+                post_heartbeats(api_url, [{"node_id": node_id, "load": load}])
+        except OSError as e:
+            print(f"Error sending heartbeat: {e}")
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node heartbeat agent")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    agent_parser = subparsers.add_parser("agent", help="Report heartbeats for one node")
+    agent_parser.add_argument("--node-id", default=os.environ.get("NODE_ID"))
+    agent_parser.add_argument("--api-url", default=os.environ.get("API_URL"))
+    agent_parser.add_argument("--aggregator", default=os.environ.get("HEARTBEAT_AGGREGATOR"),
+                              help="host:port of a sidecar aggregator")
+    agent_parser.add_argument("--interval", type=float, default=5.0)
+
+    aggregator_parser = subparsers.add_parser("aggregator", help="Coalesce heartbeats from many agents")
+    aggregator_parser.add_argument("--api-url", default=os.environ.get("API_URL"))
+    aggregator_parser.add_argument("--host", default="0.0.0.0")
+    aggregator_parser.add_argument("--port", type=int, default=9100)
+    aggregator_parser.add_argument("--flush-interval", type=float, default=2.0)
+
+    args = parser.parse_args()
+
+    if args.mode == "agent":
+        if not args.node_id or not (args.api_url or args.aggregator):
+            parser.error("agent needs --node-id and either --api-url or --aggregator")
+        run_agent(args.node_id, args.api_url, args.aggregator, args.interval)
+    else:
+        if not args.api_url:
+            parser.error("aggregator needs --api-url")
+        aggregator = HeartbeatAggregator(args.api_url, args.flush_interval)
+        threading.Thread(target=aggregator.run, daemon=True).start()
+        aggregator.serve_udp(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()